@@ -1,33 +1,78 @@
 """
 FastAPI 依賴注入
 """
-from fastapi import Depends, HTTPException, status
+import hashlib
+import hmac
+import threading
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from typing import Annotated
+from typing import Annotated, Optional
+from cachetools import TTLCache
 from app.services.auth_service import AuthService
 from app.models.schemas import UserInDB
-from app.config import ACCESS_TOKEN_EXPIRE_MINUTES
+from app.config import ACCESS_TOKEN_EXPIRE_MINUTES, INTERNAL_API_SECRET
 
-# OAuth2 設定
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+# OAuth2 設定（auto_error=False：內部服務呼叫可不帶 Bearer token）
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
-# 創建全域 AuthService 實例（用於依賴注入）
-_auth_service_instance = None
+# 內部服務呼叫（X-Internal-Token）的預期值，啟動時計算一次；未設定密鑰時停用
+INTERNAL_TOKEN_HEADER = "X-Internal-Token"
+_internal_token: Optional[str] = (
+    hmac.new(INTERNAL_API_SECRET.encode('utf-8'), b'admin', hashlib.sha256).hexdigest()
+    if INTERNAL_API_SECRET else None
+)
 
-def get_auth_service() -> AuthService:
-    """取得 AuthService 實例（單例模式）"""
-    global _auth_service_instance
-    if _auth_service_instance is None:
-        _auth_service_instance = AuthService()
-    return _auth_service_instance
+# 內部服務呼叫使用的虛擬管理員
+_internal_service_user = UserInDB(
+    id="INTERNAL-SERVICE",
+    username="internal-service",
+    full_name="內部服務",
+    is_admin=True,
+    is_active=True,
+    created_at="",
+)
+
+# Token 驗證結果快取（key 為 token 的 SHA-256 雜湊，不保存原始 token）
+# 只快取驗證成功的結果，無效 token 會拋出例外，不會寫入快取
+TOKEN_CACHE_TTL_SECONDS = 30
+_token_cache: "TTLCache[str, UserInDB]" = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL_SECONDS)
+_token_cache_lock = threading.Lock()
+
+
+def get_auth_service(request: Request) -> AuthService:
+    """取得 AuthService 實例（於 lifespan 啟動時建立）"""
+    return request.app.state.auth_service
 
 
 def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
+    request: Request,
+    token: Annotated[Optional[str], Depends(oauth2_scheme)],
     auth_service: Annotated[AuthService, Depends(get_auth_service)]
 ) -> UserInDB:
-    """取得當前使用者（從 Token）"""
-    return auth_service.get_current_user_from_token(token)
+    """取得當前使用者（從 Token，驗證結果會短暫快取）"""
+    # 內部服務呼叫：單次常數時間比較，跳過 JWT 解碼與資料庫查詢
+    if _internal_token is not None:
+        internal_token = request.headers.get(INTERNAL_TOKEN_HEADER)
+        if internal_token and hmac.compare_digest(internal_token, _internal_token):
+            return _internal_service_user
+    
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    key = hashlib.sha256(token.encode('utf-8')).hexdigest()[:32]
+    with _token_cache_lock:
+        cached_user = _token_cache.get(key)
+    if cached_user is not None:
+        return cached_user
+    
+    user = auth_service.get_current_user_from_token(token)
+    with _token_cache_lock:
+        _token_cache[key] = user
+    return user
 
 
 def get_current_active_user(
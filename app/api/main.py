@@ -1,24 +1,65 @@
 """
 FastAPI 主應用程式
 """
+from contextlib import asynccontextmanager
+import anyio.to_thread
 from fastapi import FastAPI
-from app.core.database import init_db
+from fastapi.responses import ORJSONResponse
+from app.config import GOOGLE_MAPS_API_KEY, API_THREAD_LIMIT
+from app.core.database import init_db, warm_up_pool
 from app.core.logger import setup_logger
+from app.services.auth_service import AuthService
+from app.services.geocoding_service import GeocodingService
+from app.services.job_service import JobService
+from app.services.application_service import ApplicationService
+from app.services.rich_menu_service import LineRichMenuService
 from app.api.routes import auth, geocoding, jobs, users, rich_menu
 
 # 設置 logger
 logger = setup_logger(__name__)
 
-# 建立 FastAPI 應用程式
-api_app = FastAPI(title="Good Jobs 報班系統 API", version="1.0.0")
 
-# 初始化資料庫
-try:
-    init_db()
-    logger.info("資料庫初始化完成")
-except Exception as e:
-    logger.warning(f"資料庫初始化失敗：{e}", exc_info=True)
-    logger.warning("將繼續使用記憶體儲存（資料不會持久化）")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """應用程式生命週期：啟動時初始化資料庫，並一次性建立所有服務存放於 app.state"""
+    # 同步路由（資料庫查詢）在執行緒池中執行，放寬預設的 40 條上限避免高併發時排隊
+    anyio.to_thread.current_default_thread_limiter().total_tokens = API_THREAD_LIMIT
+    
+    # 初始化資料庫（在啟動時執行，而非模組導入時）
+    try:
+        init_db()
+        logger.info("資料庫初始化完成")
+    except Exception as e:
+        logger.warning(f"資料庫初始化失敗：{e}", exc_info=True)
+        logger.warning("將繼續使用記憶體儲存（資料不會持久化）")
+    
+    try:
+        warm_up_pool()
+    except Exception as e:
+        logger.warning(f"資料庫連線池預熱失敗：{e}", exc_info=True)
+    
+    app.state.auth_service = AuthService()
+    app.state.geocoding_service = GeocodingService(api_key=GOOGLE_MAPS_API_KEY)
+    app.state.job_service = JobService(geocoding_service=app.state.geocoding_service)
+    app.state.application_service = ApplicationService()
+    app.state.rich_menu_service = LineRichMenuService()
+    logger.info("API 服務初始化完成")
+    
+    # 預先產生 OpenAPI schema（FastAPI 會快取於 app.openapi_schema），避免第一次存取文件時的延遲
+    try:
+        app.openapi()
+    except Exception as e:
+        logger.warning(f"OpenAPI schema 產生失敗：{e}", exc_info=True)
+    yield
+
+
+# 建立 FastAPI 應用程式（預設使用 orjson 序列化回應）
+api_app = FastAPI(
+    title="Good Jobs 報班系統 API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 # 註冊路由
 api_app.include_router(auth.router)
@@ -29,7 +70,7 @@ api_app.include_router(rich_menu.router)
 
 
 @api_app.get("/")
-def root():
+async def root():
     """根路徑"""
     return {
         "message": "Good Jobs 報班系統 API",
@@ -0,0 +1,53 @@
+"""
+FastAPI 回應工具
+"""
+import hashlib
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+
+# 預設快取策略：僅限使用者端快取，每次使用前都需以 ETag 重新驗證
+DEFAULT_CACHE_CONTROL = "private, max-age=0, must-revalidate"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """檢查 If-None-Match 標頭是否包含指定的 ETag（忽略弱比對前綴 W/）"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def conditional_json_response(
+    request: Request,
+    content: Any,
+    cache_control: str = DEFAULT_CACHE_CONTROL
+) -> Response:
+    """
+    建立支援條件式 GET 的 JSON 回應
+
+    參數:
+        request: 目前的請求
+        content: 回應內容（可包含 Pydantic 模型）
+        cache_control: Cache-Control 標頭值
+
+    返回:
+        Response: If-None-Match 相符時為 304，否則為帶有 ETag 的 JSON 回應
+    """
+    body = orjson.dumps(jsonable_encoder(content))
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type=ORJSONResponse.media_type, headers=headers)
@@ -50,21 +50,8 @@ def login(
 
 
 @router.get("/me", response_model=User)
-def get_current_user_info(
+async def get_current_user_info(
     current_user: UserInDB = Depends(get_current_active_user)
 ):
     """取得當前使用者資訊"""
-    return User(
-        id=current_user.id,
-        username=current_user.username,
-        email=current_user.email,
-        full_name=current_user.full_name,
-        birthday=current_user.birthday,
-        phone=current_user.phone,
-        address=current_user.address,
-        id_number=current_user.id_number,
-        is_admin=current_user.is_admin,
-        is_active=current_user.is_active,
-        created_at=current_user.created_at,
-        line_user_id=current_user.line_user_id
-    )
+    return current_user.to_public()
@@ -1,7 +1,7 @@
 """
 地理編碼相關 API 路由
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from pydantic import BaseModel, Field
 from typing import Optional
 
@@ -13,16 +13,10 @@ from fastapi import Depends
 
 router = APIRouter(prefix="/api/geocode", tags=["地理編碼"])
 
-# 創建全域 GeocodingService 實例
-_geocoding_service_instance = None
 
-def get_geocoding_service() -> GeocodingService:
-    """取得 GeocodingService 實例（單例模式）"""
-    global _geocoding_service_instance
-    if _geocoding_service_instance is None:
-        from app.config import GOOGLE_MAPS_API_KEY
-        _geocoding_service_instance = GeocodingService(api_key=GOOGLE_MAPS_API_KEY)
-    return _geocoding_service_instance
+def get_geocoding_service(request: Request) -> GeocodingService:
+    """取得 GeocodingService 實例（於 lifespan 啟動時建立）"""
+    return request.app.state.geocoding_service
 
 
 class GeocodeRequest(BaseModel):
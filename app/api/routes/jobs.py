@@ -2,37 +2,30 @@
 工作管理相關 API 路由
 """
 from typing import List
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
 
 from app.services.job_service import JobService
 from app.services.application_service import ApplicationService
 from app.models.schemas import Job, Application, CreateJobRequest
 from app.api.dependencies import get_current_active_user, require_admin
+from app.api.responses import conditional_json_response
 from app.models.schemas import UserInDB
+from app.models.job import ApplicationModel
+from app.core.database import get_db
 from typing import Annotated
 
 router = APIRouter(prefix="/api/jobs", tags=["工作管理"])
 
-# 創建服務實例（單例模式）
-_job_service_instance = None
-_application_service_instance = None
 
-def get_job_service() -> JobService:
-    """取得 JobService 實例"""
-    global _job_service_instance
-    if _job_service_instance is None:
-        from app.services.geocoding_service import GeocodingService
-        from app.config import GOOGLE_MAPS_API_KEY
-        geocoding_service = GeocodingService(api_key=GOOGLE_MAPS_API_KEY)
-        _job_service_instance = JobService(geocoding_service=geocoding_service)
-    return _job_service_instance
+def get_job_service(request: Request) -> JobService:
+    """取得 JobService 實例（於 lifespan 啟動時建立）"""
+    return request.app.state.job_service
 
-def get_application_service() -> ApplicationService:
-    """取得 ApplicationService 實例"""
-    global _application_service_instance
-    if _application_service_instance is None:
-        _application_service_instance = ApplicationService()
-    return _application_service_instance
+def get_application_service(request: Request) -> ApplicationService:
+    """取得 ApplicationService 實例（於 lifespan 啟動時建立）"""
+    return request.app.state.application_service
 
 
 @router.post("", response_model=Job, status_code=201)
@@ -51,65 +44,62 @@ def create_job(
 
 @router.get("", response_model=List[Job])
 def get_all_jobs(
+    request: Request,
     current_user: Annotated[UserInDB, Depends(get_current_active_user)],
     job_service: Annotated[JobService, Depends(get_job_service)]
 ):
-    """取得所有工作（需要認證）"""
-    return job_service.get_all_jobs()
+    """取得所有工作（需要認證，支援 ETag 條件式請求）"""
+    return conditional_json_response(request, job_service.get_all_jobs())
 
 
 @router.get("/{job_id}", response_model=Job)
 def get_job(
     job_id: str,
+    request: Request,
     current_user: Annotated[UserInDB, Depends(get_current_active_user)],
     job_service: Annotated[JobService, Depends(get_job_service)]
 ):
-    """取得特定工作（需要認證）"""
+    """取得特定工作（需要認證，支援 ETag 條件式請求）"""
     job = job_service.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="工作不存在")
-    return job
+    return conditional_json_response(request, job)
 
 
 @router.get("/{job_id}/applications", response_model=List[Application])
 def get_job_applications(
     job_id: str,
     current_user: Annotated[UserInDB, Depends(require_admin)],
-    job_service: Annotated[JobService, Depends(get_job_service)],
     application_service: Annotated[ApplicationService, Depends(get_application_service)]
 ):
     """取得工作的報班清單（需要管理員權限）"""
-    job = job_service.get_job(job_id)
-    if not job:
+    applications = application_service.get_job_applications_if_job_exists(job_id)
+    if applications is None:
         raise HTTPException(status_code=404, detail="工作不存在")
-    
-    applications = application_service.get_job_applications(job_id)
-    return applications
+    # 直接回傳 ORJSONResponse，避免 FastAPI 依 response_model 再驗證一次
+    return ORJSONResponse(content=[app.model_dump(mode='json') for app in applications])
 
 
 @router.get("/applications/all", response_model=List[Application])
 def get_all_applications(
     current_user: Annotated[UserInDB, Depends(require_admin)],
-    application_service: Annotated[ApplicationService, Depends(get_application_service)]
+    db: Annotated[Session, Depends(get_db)]
 ):
     """取得所有報班記錄（需要管理員權限）"""
-    from app.core.database import SessionLocal
-    from app.models.job import ApplicationModel
-    from sqlalchemy.sql import func
-    
-    db = SessionLocal()
-    try:
-        app_models = db.query(ApplicationModel).order_by(ApplicationModel.applied_at.desc()).all()
-        return [
-            Application(
-                id=app.id,
-                job_id=app.job_id,
-                user_id=app.user_id,
-                user_name=app.user_name,
-                shift=app.shift,
-                applied_at=app.applied_at.strftime('%Y-%m-%d %H:%M:%S')
-            )
-            for app in app_models
-        ]
-    finally:
-        db.close()
+    # 只查詢需要的欄位（不建立 ORM 物件），並分批讀取以降低記憶體用量
+    rows = db.query(
+        ApplicationModel.id,
+        ApplicationModel.job_id,
+        ApplicationModel.user_id,
+        ApplicationModel.user_name,
+        ApplicationModel.shift,
+        ApplicationModel.applied_at
+    ).order_by(ApplicationModel.applied_at.desc()).yield_per(500)
+    # 直接回傳 ORJSONResponse，避免 FastAPI 依 response_model 對每一列再驗證一次
+    # （response_model 仍保留，用於 API 文件）
+    applications = []
+    for row in rows:
+        application = row._asdict()
+        application['applied_at'] = row.applied_at.strftime('%Y-%m-%d %H:%M:%S')
+        applications.append(application)
+    return ORJSONResponse(content=applications)
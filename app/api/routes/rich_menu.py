@@ -1,26 +1,35 @@
 """
 LINE Rich Menu 管理 API 路由
 """
+from pathlib import Path
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
+import aiofiles
+from fastapi import APIRouter, HTTPException, Depends, Request, UploadFile, File, Form
 from pydantic import BaseModel, Field
 from typing import Annotated
 
 from app.services.rich_menu_service import LineRichMenuService
 from app.api.dependencies import get_current_active_user, require_admin
+from app.api.responses import conditional_json_response
 from app.models.schemas import UserInDB
 
 router = APIRouter(prefix="/api/rich-menu", tags=["Rich Menu 管理"])
 
-# 創建服務實例（單例模式）
-_rich_menu_service_instance = None
+# 上傳檔案分塊寫入大小（64KB），避免將整個圖片讀入記憶體
+UPLOAD_CHUNK_SIZE = 64 * 1024
 
-def get_rich_menu_service() -> LineRichMenuService:
-    """取得 LineRichMenuService 實例"""
-    global _rich_menu_service_instance
-    if _rich_menu_service_instance is None:
-        _rich_menu_service_instance = LineRichMenuService()
-    return _rich_menu_service_instance
+
+def get_rich_menu_service(request: Request) -> LineRichMenuService:
+    """取得 LineRichMenuService 實例（於 lifespan 啟動時建立）"""
+    return request.app.state.rich_menu_service
+
+
+async def _save_upload_to_temp(upload_file: UploadFile) -> str:
+    """將上傳檔案分塊寫入臨時檔案，返回臨時檔案路徑"""
+    async with aiofiles.tempfile.NamedTemporaryFile('wb', delete=False, suffix='.jpg') as tmp_file:
+        while chunk := await upload_file.read(UPLOAD_CHUNK_SIZE):
+            await tmp_file.write(chunk)
+        return str(tmp_file.name)
 
 
 class RichMenuCreateRequest(BaseModel):
@@ -42,10 +51,10 @@ class RichMenuDeleteRequest(BaseModel):
 
 @router.post("/create/registered", summary="建立已註冊用戶的 Rich Menu")
 async def create_registered_user_rich_menu(
+    current_user: Annotated[UserInDB, Depends(require_admin)],
+    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)],
     image_path: Optional[str] = Form(None, description="圖片檔案路徑"),
-    image_file: Optional[UploadFile] = File(None, description="圖片檔案（可選）"),
-    current_user: Annotated[UserInDB, Depends(require_admin)] = None,
-    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)] = None
+    image_file: Optional[UploadFile] = File(None, description="圖片檔案（可選）")
 ):
     """
     建立已註冊用戶的 Rich Menu
@@ -64,11 +73,7 @@ async def create_registered_user_rich_menu(
         # 如果有提供圖片，上傳圖片
         if image_file:
             # 保存上傳的檔案到臨時位置
-            import tempfile
-            import os
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
-                tmp_file.write(await image_file.read())
-                tmp_path = tmp_file.name
+            tmp_path = await _save_upload_to_temp(image_file)
             
             try:
                 success = rich_menu_service.upload_rich_menu_image(rich_menu_id, tmp_path)
@@ -78,8 +83,7 @@ async def create_registered_user_rich_menu(
                     raise HTTPException(status_code=500, detail="上傳 Rich Menu 圖片失敗")
             finally:
                 # 清理臨時檔案
-                if os.path.exists(tmp_path):
-                    os.remove(tmp_path)
+                Path(tmp_path).unlink(missing_ok=True)
         elif image_path:
             success = rich_menu_service.upload_rich_menu_image(rich_menu_id, image_path)
             if not success:
@@ -100,10 +104,10 @@ async def create_registered_user_rich_menu(
 
 @router.post("/create/unregistered", summary="建立未註冊用戶的 Rich Menu")
 async def create_unregistered_user_rich_menu(
+    current_user: Annotated[UserInDB, Depends(require_admin)],
+    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)],
     image_path: Optional[str] = Form(None, description="圖片檔案路徑"),
-    image_file: Optional[UploadFile] = File(None, description="圖片檔案（可選）"),
-    current_user: Annotated[UserInDB, Depends(require_admin)] = None,
-    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)] = None
+    image_file: Optional[UploadFile] = File(None, description="圖片檔案（可選）")
 ):
     """
     建立未註冊用戶的 Rich Menu
@@ -122,11 +126,7 @@ async def create_unregistered_user_rich_menu(
         # 如果有提供圖片，上傳圖片
         if image_file:
             # 保存上傳的檔案到臨時位置
-            import tempfile
-            import os
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
-                tmp_file.write(await image_file.read())
-                tmp_path = tmp_file.name
+            tmp_path = await _save_upload_to_temp(image_file)
             
             try:
                 success = rich_menu_service.upload_rich_menu_image(rich_menu_id, tmp_path)
@@ -136,8 +136,7 @@ async def create_unregistered_user_rich_menu(
                     raise HTTPException(status_code=500, detail="上傳 Rich Menu 圖片失敗")
             finally:
                 # 清理臨時檔案
-                if os.path.exists(tmp_path):
-                    os.remove(tmp_path)
+                Path(tmp_path).unlink(missing_ok=True)
         elif image_path:
             success = rich_menu_service.upload_rich_menu_image(rich_menu_id, image_path)
             if not success:
@@ -159,8 +158,8 @@ async def create_unregistered_user_rich_menu(
 @router.post("/set-default", summary="設定預設 Rich Menu")
 def set_default_rich_menu(
     request: RichMenuSetRequest,
-    current_user: Annotated[UserInDB, Depends(require_admin)] = None,
-    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)] = None
+    current_user: Annotated[UserInDB, Depends(require_admin)],
+    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)]
 ):
     """
     設定預設 Rich Menu（所有用戶都會看到）
@@ -180,8 +179,8 @@ def set_default_rich_menu(
 @router.post("/set-user", summary="為特定用戶設定 Rich Menu")
 def set_user_rich_menu(
     request: RichMenuSetRequest,
-    current_user: Annotated[UserInDB, Depends(require_admin)] = None,
-    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)] = None
+    current_user: Annotated[UserInDB, Depends(require_admin)],
+    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)]
 ):
     """
     為特定用戶設定 Rich Menu
@@ -203,48 +202,50 @@ def set_user_rich_menu(
 
 @router.get("/list", summary="取得所有 Rich Menu 列表")
 def get_rich_menu_list(
-    current_user: Annotated[UserInDB, Depends(require_admin)] = None,
-    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)] = None
+    request: Request,
+    current_user: Annotated[UserInDB, Depends(require_admin)],
+    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)]
 ):
     """
     取得所有 Rich Menu 列表
     
-    需要管理員權限
+    需要管理員權限，支援 ETag 條件式請求
     """
     rich_menus = rich_menu_service.get_rich_menu_list()
-    return {
+    return conditional_json_response(request, {
         "success": True,
         "rich_menus": rich_menus,
         "count": len(rich_menus)
-    }
+    })
 
 
 @router.get("/{rich_menu_id}", summary="取得 Rich Menu 詳細資訊")
 def get_rich_menu(
     rich_menu_id: str,
-    current_user: Annotated[UserInDB, Depends(require_admin)] = None,
-    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)] = None
+    request: Request,
+    current_user: Annotated[UserInDB, Depends(require_admin)],
+    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)]
 ):
     """
     取得 Rich Menu 詳細資訊
     
-    需要管理員權限
+    需要管理員權限，支援 ETag 條件式請求
     """
     rich_menu = rich_menu_service.get_rich_menu(rich_menu_id)
     if not rich_menu:
         raise HTTPException(status_code=404, detail="找不到指定的 Rich Menu")
     
-    return {
+    return conditional_json_response(request, {
         "success": True,
         "rich_menu": rich_menu
-    }
+    })
 
 
 @router.delete("/{rich_menu_id}", summary="刪除 Rich Menu")
 def delete_rich_menu(
     rich_menu_id: str,
-    current_user: Annotated[UserInDB, Depends(require_admin)] = None,
-    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)] = None
+    current_user: Annotated[UserInDB, Depends(require_admin)],
+    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)]
 ):
     """
     刪除 Rich Menu
@@ -264,8 +265,8 @@ def delete_rich_menu(
 @router.delete("/user/{user_id}", summary="刪除用戶的 Rich Menu")
 def delete_user_rich_menu(
     user_id: str,
-    current_user: Annotated[UserInDB, Depends(require_admin)] = None,
-    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)] = None
+    current_user: Annotated[UserInDB, Depends(require_admin)],
+    rich_menu_service: Annotated[LineRichMenuService, Depends(get_rich_menu_service)]
 ):
     """
     刪除特定用戶的 Rich Menu
@@ -3,11 +3,13 @@
 """
 from typing import List
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
 
 from app.services.auth_service import AuthService
 from app.models.schemas import User, UserInDB
 from app.api.dependencies import require_admin, get_auth_service
-from app.core.database import SessionLocal
+from app.core.database import get_db
 from app.core.time_utils import format_datetime_taiwan
 from app.models.user import UserModel
 from typing import Annotated
@@ -17,31 +19,33 @@ router = APIRouter(prefix="/api/users", tags=["使用者管理"])
 
 @router.get("", response_model=List[User])
 def get_all_users(
-    current_user: Annotated[UserInDB, Depends(require_admin)]
+    current_user: Annotated[UserInDB, Depends(require_admin)],
+    db: Annotated[Session, Depends(get_db)]
 ):
     """取得所有使用者列表（需要管理員權限）"""
-    db = SessionLocal()
-    try:
-        user_models = db.query(UserModel).order_by(UserModel.created_at.desc()).all()
-        return [
-            User(
-                id=user.id,
-                username=user.username,
-                email=user.email,
-                full_name=user.full_name,
-                birthday=user.birthday,
-                phone=user.phone,
-                address=user.address,
-                id_number=user.id_number,
-                is_admin=user.is_admin,
-                is_active=user.is_active,
-                created_at=format_datetime_taiwan(user.created_at),
-                line_user_id=user.line_user_id
-            )
-            for user in user_models
-        ]
-    finally:
-        db.close()
+    # 只查詢需要的欄位（不建立 ORM 物件），並分批讀取以降低記憶體用量
+    rows = db.query(
+        UserModel.id,
+        UserModel.username,
+        UserModel.email,
+        UserModel.full_name,
+        UserModel.birthday,
+        UserModel.phone,
+        UserModel.address,
+        UserModel.id_number,
+        UserModel.is_admin,
+        UserModel.is_active,
+        UserModel.created_at,
+        UserModel.line_user_id
+    ).order_by(UserModel.created_at.desc()).yield_per(500)
+    # 直接回傳 ORJSONResponse，避免 FastAPI 依 response_model 對每一列再驗證一次
+    # （response_model 仍保留，用於 API 文件）
+    users = []
+    for row in rows:
+        user = row._asdict()
+        user['created_at'] = format_datetime_taiwan(row.created_at)
+        users.append(user)
+    return ORJSONResponse(content=users)
 
 
 @router.get("/{username}", response_model=User)
@@ -54,17 +58,4 @@ def get_user(
     user = auth_service.get_user_by_username(username)
     if not user:
         raise HTTPException(status_code=404, detail="使用者不存在")
-    return User(
-        id=user.id,
-        username=user.username,
-        email=user.email,
-        full_name=user.full_name,
-        birthday=user.birthday,
-        phone=user.phone,
-        address=user.address,
-        id_number=user.id_number,
-        is_admin=user.is_admin,
-        is_active=user.is_active,
-        created_at=user.created_at,
-        line_user_id=user.line_user_id
-    )
+    return user.to_public()
@@ -1,20 +1,32 @@
 """
 Good Jobs 報班系統 - LINE Bot 主應用程式
 """
-from typing import Dict, Optional
-import json
+from typing import Callable, Dict, List, Optional, Tuple
+import os
+import sys
+import time
+import atexit
+import queue
+import logging
+import threading
+import warnings
 import hmac
-import hashlib
 import base64
+import binascii
+import ssl
 import urllib.parse
+from pathlib import Path
+import orjson
 from flask import Flask, request
 
 from app.services.job_service import JobService
 from app.services.application_service import ApplicationService
 from app.services.line_message_service import LineMessageService
 from app.services.auth_service import AuthService
+from app.services.geocoding_service import GeocodingService
 from app.bot.handler import JobHandler
 from app.core.logger import setup_logger, setup_gunicorn_logger, DEFAULT_LOG_FORMAT, DEFAULT_DATE_FORMAT
+from app.config import LINE_CHANNEL_ACCESS_TOKEN, LINE_CHANNEL_SECRET, REPLY_WORKERS, REPLY_QUEUE_SIZE, GUNICORN_THREADS
 
 # 在模組導入時就配置好 Gunicorn logger，確保啟動訊息也使用統一格式
 # 這樣當 Gunicorn 啟動時，所有日誌都會使用統一的格式
@@ -23,36 +35,84 @@ setup_gunicorn_logger()
 # 設置 logger
 logger = setup_logger(__name__)
 
-# Gunicorn 需要這個變數來獲取 Flask 應用程式
-# 這將在 PartTimeJobBot 初始化時設置
-flask_app = None
+# Webhook 請求 body 大小上限（LINE Webhook 遠小於此值），超過時不讀取也不計算簽名
+MAX_WEBHOOK_BODY_BYTES = 64 * 1024
 
-def get_flask_app():
-    """Gunicorn 使用的 WSGI 應用程式獲取函數（返回應用程式實例）"""
-    global flask_app
-    if flask_app is None:
-        # 如果還沒有實例，創建一個臨時實例
-        # 這通常不會發生，因為 main.py 會先創建實例
-        from app.config import LINE_CHANNEL_ACCESS_TOKEN, LINE_CHANNEL_SECRET
-        from app.services.job_service import JobService
-        from app.services.application_service import ApplicationService
-        from app.services.auth_service import AuthService
-        from app.services.geocoding_service import GeocodingService
-        
-        geocoding_service = GeocodingService()
-        job_service = JobService(geocoding_service=geocoding_service)
-        application_service = ApplicationService()
-        auth_service = AuthService()
-        
-        temp_bot = PartTimeJobBot(
-            channel_access_token=LINE_CHANNEL_ACCESS_TOKEN,
-            job_service=job_service,
-            application_service=application_service,
-            channel_secret=LINE_CHANNEL_SECRET,
-            auth_service=auth_service
-        )
-        flask_app = temp_bot.flask_app
-    return flask_app
+# Gunicorn 配置檔路徑（專案根目錄下的 gunicorn_config.py）
+GUNICORN_CONFIG_PATH = str(Path(__file__).resolve().parents[2] / "gunicorn_config.py")
+
+# 應用程式日誌級別 -> Gunicorn 日誌級別（Gunicorn 使用小寫）
+GUNICORN_LOG_LEVELS = {
+    "DEBUG": "debug",
+    "INFO": "info",
+    "WARNING": "warning",
+    "ERROR": "error",
+    "CRITICAL": "critical"
+}
+
+# 進程結束前等待背景佇列清空的上限（秒），需小於 gunicorn_config.py 的 graceful_timeout（30 秒）
+EVENT_DRAIN_TIMEOUT_SECONDS = 25
+
+# X-Line-Signature 長度：32 bytes HMAC-SHA256 的 base64 編碼固定為 44 字元
+LINE_SIGNATURE_LENGTH = 44
+
+# 文字指令對應表（正規化後的訊息文字 -> JobHandler 方法名稱）
+_COMMAND_TABLE: Dict[str, str] = {
+    **dict.fromkeys(('選單', 'menu', 'menus'), 'show_main_menu'),
+    **dict.fromkeys(('可報班工作', '工作', 'jobs', 'list'), 'show_available_jobs'),
+    **dict.fromkeys(('已報班', '我的報班', '報班記錄', 'applications'), 'show_user_applications'),
+    **dict.fromkeys(('註冊報班帳號', 'register'), 'handle_register'),
+}
+
+
+def _parse_postback(data: str) -> Dict[str, str]:
+    """
+    解析 LINE postback data（key=value&key=value 格式）
+    
+    參數:
+        data: postback data 字串
+    
+    返回:
+        Dict[str, str]: 解碼後的鍵值對（同名鍵以最後一個為準）
+    """
+    parsed = {}
+    for pair in data.split('&'):
+        key, _, value = pair.partition('=')
+        if '%' in value or '+' in value:
+            value = urllib.parse.unquote_plus(value)
+        parsed[key] = value
+    return parsed
+
+# 修改資料提示訊息範本（key 同時是使用者資料欄位名稱）
+_EDIT_PROMPTS: Dict[str, str] = {
+    'phone': "📞 修改手機號碼\n\n目前的手機號碼：{current}\n\n請輸入新的手機號碼（格式：09XX-XXX-XXX 或 09XXXXXXXX）：\n\n或輸入「取消」取消修改。",
+    'address': "🏠 修改地址\n\n目前的地址：{current}\n\n請輸入新的地址：\n\n或輸入「取消」取消修改。",
+    'email': "📬 修改 Email\n\n目前的 Email：{current}\n\n請輸入新的 Email：\n\n（可選，輸入「跳過」可清除 Email）\n或輸入「取消」取消修改。",
+}
+
+def create_app() -> Flask:
+    """
+    Gunicorn 使用的 WSGI 應用程式工廠
+    
+    每個 worker 在 fork 後各自建立服務與 Flask 應用程式，
+    避免資料庫連線、執行緒鎖等資源跨進程共用。
+    
+    返回:
+        Flask: LINE Webhook 的 Flask 應用程式
+    """
+    geocoding_service = GeocodingService()
+    job_service = JobService(geocoding_service=geocoding_service)
+    application_service = ApplicationService()
+    auth_service = AuthService()
+    
+    bot = PartTimeJobBot(
+        channel_access_token=LINE_CHANNEL_ACCESS_TOKEN,
+        job_service=job_service,
+        application_service=application_service,
+        channel_secret=LINE_CHANNEL_SECRET,
+        auth_service=auth_service
+    )
+    return bot.flask_app
 
 class PartTimeJobBot:
     """Good Jobs 報班系統主應用程式"""
@@ -62,16 +122,61 @@ class PartTimeJobBot:
         self.job_service = job_service
         self.application_service = application_service
         self.message_service = LineMessageService(channel_access_token)
+        # 在各 worker 初始化時預熱 LINE API 連線，避免第一個請求承擔 DNS/TLS 成本
+        self.message_service.warm_up()
         self.handler = JobHandler(self.job_service, self.application_service, self.message_service, auth_service)
+        # 清除使用者中途放棄而殘留的註冊/編輯狀態，避免狀態表無限增長
+        self.handler.state_service.cleanup_expired_states()
         self.channel_secret = channel_secret
+        # 預先編碼 Channel Secret，避免每個 Webhook 請求重複編碼
+        self._secret_bytes = channel_secret.encode('utf-8') if channel_secret else None
+        # 預先以 Secret 建立 HMAC 狀態（ipad/opad 已套用），每次請求只需複製狀態再更新 body
+        # 以演算法名稱指定 digestmod，直接使用 OpenSSL 的 HMAC 實作（支援 SHA-NI 加速）
+        self._hmac_template = hmac.new(self._secret_bytes, digestmod='sha256') if self._secret_bytes else None
+        if not self._secret_bytes:
+            logger.warning("未設定 Channel Secret，Webhook 將跳過簽名驗證（僅限開發模式）")
+        else:
+            # 記錄簽名驗證使用的 OpenSSL 版本（SHA-256 由 OpenSSL 依 CPU 指令集加速，如 SHA-NI）
+            logger.info(f"Webhook 簽名驗證：HMAC-SHA256 via {ssl.OPENSSL_VERSION}")
+        
+        # Webhook 事件分派表：event type -> 處理函數（其他類型如 follow/unfollow 忽略）
+        self._event_dispatch: Dict[str, Callable] = {
+            'message': self._handle_message,
+            'postback': self._handle_postback,
+        }
+        
+        # postback 分派表：(action, step) -> (處理函數, 必要參數)
+        # 必要參數依序從 postback data 取出，任一為空時不處理
+        h = self.handler
+        self._postback_table: Dict[Tuple[str, str], Tuple[Callable, Tuple[str, ...]]] = {
+            ('register', 'register'): (h.handle_register, ()),
+            ('edit_profile', 'select_field'): (h.handle_edit_profile, ()),
+            ('edit_profile', 'input'): (self._handle_edit_profile_input_prompt, ('field',)),
+            ('view_profile', 'view'): (h.show_user_profile, ()),
+            ('delete_registration', 'confirm'): (h.handle_delete_registration, ()),
+            ('delete_registration', 'confirm_delete'): (h.handle_confirm_delete_registration, ()),
+            ('job', 'list'): (h.show_available_jobs, ()),
+            ('job', 'detail'): (h.show_job_detail, ('job_id',)),
+            ('job', 'apply'): (h.handle_apply_job, ('job_id',)),
+            ('job', 'select_shift'): (h.handle_select_shift, ('job_id', 'shift')),
+            ('job', 'cancel'): (h.handle_cancel_application, ('job_id',)),
+            ('job', 'confirm_cancel'): (h.handle_confirm_cancel, ('job_id',)),
+            ('job', 'my_applications'): (h.show_user_applications, ()),
+            ('job', 'menu'): (h.show_main_menu, ()),
+        }
+        
+        # 背景事件處理佇列（於各進程首次收到事件時才啟動，確保 Gunicorn fork 後執行緒存在）
+        # 每個背景執行緒各有一個佇列，同一使用者的事件固定進入同一佇列，依序處理
+        self._event_queues: List[queue.Queue] = []
+        self._event_workers_pid: Optional[int] = None
+        self._event_workers_lock = threading.Lock()
+        # 進程結束中時不再放入佇列，改為直接處理
+        self._accepting_events = True
         
         # 建立 Flask 應用程式（用於 LINE Webhook）
         self.flask_app = Flask(__name__)
+        self.flask_app.config['MAX_CONTENT_LENGTH'] = MAX_WEBHOOK_BODY_BYTES
         self._setup_routes()
-        
-        # 註冊報班帳號 Flask 應用程式實例供 Gunicorn 使用
-        global flask_app
-        flask_app = self.flask_app
     
     def _setup_routes(self):
         """設定路由"""
@@ -91,24 +196,31 @@ class PartTimeJobBot:
         返回:
             bool: 驗證是否通過
         """
-        if not self.channel_secret:
-            # 如果沒有設定 channel_secret，跳過驗證（開發模式）
-            logger.warning("未設定 Channel Secret，跳過簽名驗證")
+        template = self._hmac_template
+        if template is None:
+            # 如果沒有設定 channel_secret，跳過驗證（開發模式，已於初始化時警告）
             return True
         
+        # 長度不符的簽名必定不合法，不必解碼或計算 HMAC
+        if len(signature) != LINE_SIGNATURE_LENGTH:
+            return False
+        
+        # 先解碼收到的簽名：格式不合法時不必計算 HMAC
         try:
-            # 使用 Channel Secret 和請求體計算 HMAC-SHA256
-            hash_value = hmac.new(
-                self.channel_secret.encode('utf-8'),
-                body,
-                hashlib.sha256
-            ).digest()
-            
-            # 轉換為 base64
-            expected_signature = base64.b64encode(hash_value).decode('utf-8')
+            provided = base64.b64decode(signature, validate=True)
+        except (binascii.Error, ValueError):
+            # 簽名不是合法的 base64（或含非 ASCII 字元），必定不合法
+            return False
+        if len(provided) != template.digest_size:
+            return False
+        
+        try:
+            # 複製預先建立的 HMAC 狀態並計算 HMAC-SHA256（不需每次重新處理金鑰）
+            mac = template.copy()
+            mac.update(body)
             
-            # 比較簽名（使用安全比較避免時間攻擊）
-            return hmac.compare_digest(expected_signature, signature)
+            # 直接比較原始摘要（使用安全比較避免時間攻擊）
+            return hmac.compare_digest(mac.digest(), provided)
         except Exception as e:
             logger.error(f"簽名驗證錯誤：{e}", exc_info=True)
             return False
@@ -116,166 +228,229 @@ class PartTimeJobBot:
     def handle_webhook(self):
         """處理 LINE Webhook"""
         try:
+            # 拒絕未標示長度（如 chunked）或過大的請求，避免對大量資料計算 HMAC
+            content_length = request.content_length
+            if content_length is None:
+                logger.warning("Webhook 請求未提供 Content-Length")
+                return 'Length Required', 411
+            if content_length > MAX_WEBHOOK_BODY_BYTES:
+                logger.warning(f"Webhook 請求 body 過大：{content_length}")
+                return 'Payload Too Large', 413
+            
             # 驗證請求簽名
             signature = request.headers.get('X-Line-Signature', '')
-            body = request.get_data()
+            # 只讀取一次原始 body（不快取於 request），簽名驗證與 JSON 解析共用
+            body = request.get_data(cache=False)
             
             if not self._verify_signature(body, signature):
                 logger.warning(f"Webhook 簽名驗證失敗，收到的簽名：{signature[:20]}...")
                 return 'Forbidden', 403
             
-            # 解析 JSON 資料
-            data = request.get_json()
+            # 空 body 無需解析
+            if not body:
+                return 'OK', 200
             
-            # 記錄接收到的資料（DEBUG 級別）
-            #logger.debug(f"收到 Webhook 資料：{json.dumps(data, indent=2, ensure_ascii=False)}")
+            # 解析 JSON 資料（直接使用已讀取的 body，避免 Flask 重複解析）
+            data = orjson.loads(body)
             
-            # 處理不同類型的事件
-            for event in data.get('events', []):
+            # LINE 的 Webhook 驗證請求 events 為空，直接回應
+            events = data.get('events') or ()
+            if not events:
+                return 'OK', 200
+            
+            # 將事件放入背景佇列，立即回應 LINE（回覆訊息由背景執行緒發送）
+            # 同一使用者的事件固定交給同一個背景執行緒，確保註冊/修改流程的步驟依序處理
+            event_queues = self._ensure_event_workers()
+            if not self._accepting_events:
+                # 進程正在結束，背景執行緒可能已無法處理新事件，直接在請求執行緒處理
+                for event in events:
+                    self._dispatch_event(event)
+                return 'OK', 200
+            
+            for event in events:
+                event_queue = event_queues[hash(self._event_user_id(event)) % len(event_queues)]
                 try:
-                    event_type = event.get('type')
-                    reply_token = event.get('replyToken')
-                    user_id = event['source'].get('userId', 'unknown')
-                    
-                    if event_type == 'message':
-                        self._handle_message(event, reply_token, user_id)
-                    elif event_type == 'postback':
-                        self._handle_postback(event, reply_token, user_id)
-                except Exception as e:
-                    logger.error(f"處理事件時發生錯誤：{e}", exc_info=True)
-                    logger.debug(f"事件資料：{json.dumps(data, indent=2, ensure_ascii=False)}")
-                    # 嘗試發送錯誤訊息給使用者
-                    try:
-                        if reply_token:
-                            self.message_service.send_text(
-                                reply_token,
-                                "❌ 處理您的請求時發生錯誤，請稍後再試。"
-                            )
-                    except:
-                        pass
+                    event_queue.put_nowait(event)
+                except queue.Full:
+                    # 佇列已滿時等待空位（不改為同步處理，以免越過同一使用者較早的事件）
+                    logger.warning("事件佇列已滿，等待背景執行緒處理")
+                    event_queue.put(event)
             
             return 'OK', 200
         except Exception as e:
             logger.error(f"Webhook 處理錯誤：{e}", exc_info=True)
             return 'OK', 200  # 即使出錯也返回 OK，避免 LINE 重試
     
+    @staticmethod
+    def _event_user_id(event: Dict) -> str:
+        """取得事件來源的 LINE User ID（非 dict 或無來源的事件返回空字串）"""
+        if not isinstance(event, dict):
+            return ''
+        source = event.get('source') or {}
+        return source.get('userId') or ''
+    
+    def _ensure_event_workers(self) -> List[queue.Queue]:
+        """
+        確保目前進程的背景事件處理執行緒已啟動
+        
+        返回:
+            List[queue.Queue]: 各背景執行緒的事件佇列
+        """
+        pid = os.getpid()
+        if self._event_workers_pid == pid:
+            return self._event_queues
+        
+        with self._event_workers_lock:
+            if self._event_workers_pid != pid:
+                # fork 後父進程的執行緒不存在，需在每個進程重新建立佇列與執行緒
+                worker_count = max(1, REPLY_WORKERS)
+                queue_size = max(1, REPLY_QUEUE_SIZE // worker_count)
+                self._event_queues = [queue.Queue(maxsize=queue_size) for _ in range(worker_count)]
+                for i, event_queue in enumerate(self._event_queues):
+                    threading.Thread(
+                        target=self._event_worker_loop,
+                        args=(event_queue,),
+                        name=f"line-event-worker-{i}",
+                        daemon=True
+                    ).start()
+                self._event_workers_pid = pid
+                # 背景執行緒為 daemon，進程結束前（含 max_requests 重啟、部署）先處理完已接收的事件
+                atexit.register(self._drain_event_queues)
+                logger.info(f"已啟動 {worker_count} 個背景事件處理執行緒 (pid: {pid})")
+        return self._event_queues
+    
+    def _drain_event_queues(self, timeout: float = EVENT_DRAIN_TIMEOUT_SECONDS) -> None:
+        """
+        停止接收新事件並等待背景佇列處理完畢（進程結束時由 atexit 呼叫）
+        
+        參數:
+            timeout: 最長等待秒數（所有佇列共用）
+        """
+        self._accepting_events = False
+        deadline = time.monotonic() + timeout
+        for event_queue in self._event_queues:
+            with event_queue.all_tasks_done:
+                while event_queue.unfinished_tasks:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    event_queue.all_tasks_done.wait(remaining)
+        
+        pending = sum(event_queue.unfinished_tasks for event_queue in self._event_queues)
+        if pending:
+            logger.warning(f"等待背景事件處理逾時，仍有 {pending} 個事件未處理 (pid: {os.getpid()})")
+        else:
+            logger.info(f"背景事件佇列已清空 (pid: {os.getpid()})")
+    
+    def _event_worker_loop(self, event_queue: queue.Queue) -> None:
+        """背景執行緒：從佇列取出事件並處理"""
+        while True:
+            event = event_queue.get()
+            try:
+                self._dispatch_event(event)
+            except Exception as e:
+                # 避免單一異常事件終止背景執行緒
+                logger.error(f"背景處理事件時發生錯誤：{e}", exc_info=True)
+            finally:
+                event_queue.task_done()
+    
+    def _dispatch_event(self, event: Dict) -> None:
+        """處理單一 Webhook 事件（錯誤時嘗試回覆使用者）"""
+        handle_event = self._event_dispatch.get(event.get('type'))
+        if handle_event is None:
+            return
+        
+        reply_token = event.get('replyToken')
+        try:
+            source = event.get('source') or {}
+            handle_event(event, reply_token, source.get('userId', 'unknown'))
+        except Exception as e:
+            logger.error(f"處理事件時發生錯誤：{e}", exc_info=True)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("事件資料：%s", orjson.dumps(event, option=orjson.OPT_INDENT_2).decode())
+            # 嘗試發送錯誤訊息給使用者
+            try:
+                if reply_token:
+                    self.message_service.send_text(
+                        reply_token,
+                        "❌ 處理您的請求時發生錯誤，請稍後再試。"
+                    )
+            except:
+                pass
+    
     def _handle_message(self, event: Dict, reply_token: str, user_id: str) -> None:
         """處理文字訊息"""
         message_text = event['message'].get('text', '')
         
-        logger.debug(f"_handle_message: 收到文字訊息：{message_text} (user_id: {user_id})")
+        handler = self.handler
+        state_service = handler.state_service
+        
+        logger.debug("_handle_message: 收到文字訊息：%s (user_id: %s)", message_text, user_id)
         # 檢查是否在註冊報班帳號流程中
-        registration_state = self.handler.state_service.get_registration_state(user_id)
+        registration_state = state_service.get_registration_state(user_id)
         if registration_state is not None:
-            self.handler.handle_register_input(reply_token, user_id, message_text)
+            handler.handle_register_input(reply_token, user_id, message_text)
             return
         
         # 檢查是否在修改資料流程中
-        edit_profile_state = self.handler.state_service.get_edit_profile_state(user_id)
+        edit_profile_state = state_service.get_edit_profile_state(user_id)
         if edit_profile_state is not None:
-            self.handler.handle_edit_profile_input(reply_token, user_id, message_text)
+            handler.handle_edit_profile_input(reply_token, user_id, message_text)
             return
         
-        if message_text.strip().lower() in ['選單', 'menu', 'menus']:
-            self.handler.show_main_menu(reply_token, user_id)
-        elif message_text.strip().lower() in ['可報班工作', '工作', 'jobs', 'list']:
-            self.handler.show_available_jobs(reply_token, user_id)
-        elif message_text.strip().lower() in ['已報班', '我的報班', '報班記錄', 'applications']:
-            self.handler.show_user_applications(reply_token, user_id)
-        elif message_text.strip().lower() in ['註冊報班帳號', 'register']:
-            self.handler.handle_register(reply_token, user_id)
-        else:
-            # 預設顯示主選單
-            self.handler.show_main_menu(reply_token, user_id)
+        # 查表分派指令（未知指令預設顯示主選單）
+        handler_name = _COMMAND_TABLE.get(message_text.strip().lower(), 'show_main_menu')
+        getattr(handler, handler_name)(reply_token, user_id)
     
     def _handle_postback(self, event: Dict, reply_token: str, user_id: str) -> None:
         """處理 postback 事件"""
         postback = event.get('postback', {})
         postback_data = postback.get('data', '')
         postback_params = postback.get('params', {})  # datetime picker 回傳的 date/time
-        logger.debug(f"_handle_postback: 收到 postback: {postback_data} params={postback_params} (user_id: {user_id})")
+        logger.debug("_handle_postback: 收到 postback: %s params=%s (user_id: %s)", postback_data, postback_params, user_id)
         
         # 解析 postback data
-        parsed_data = urllib.parse.parse_qs(postback_data)
-        action = parsed_data.get('action', [''])[0]
-        step = parsed_data.get('step', [''])[0]
-        field = parsed_data.get('field', [''])[0]
-        job_id = parsed_data.get('job_id', [''])[0]
-        shift = parsed_data.get('shift', [''])[0]
-        
-        # 解碼 shift（如果有）
-        if shift:
-            shift = urllib.parse.unquote(shift)
+        parsed_data = _parse_postback(postback_data)
+        action = parsed_data.get('action', '')
+        step = parsed_data.get('step', '')
         
         # 處理 date picker 回傳（params.date）：依流程狀態或 postback data 判斷
         if postback_params and 'date' in postback_params:
             picked_date = postback_params['date']
+            handler = self.handler
             # 依「註冊流程是否在 birthday 步驟」判斷
-            reg_state = self.handler.state_service.get_registration_state(user_id)
+            reg_state = handler.state_service.get_registration_state(user_id)
             if reg_state is not None and reg_state.get('step') == 'birthday':
-                self.handler.handle_register_birthday_picked(reply_token, user_id, picked_date)
+                handler.handle_register_birthday_picked(reply_token, user_id, picked_date)
                 return
             # 若無狀態，再依 postback data 判斷（註冊生日；修改資料不包含生日）
             if action == 'register' and step == 'birthday':
-                self.handler.handle_register_birthday_picked(reply_token, user_id, picked_date)
+                handler.handle_register_birthday_picked(reply_token, user_id, picked_date)
                 return
         
-        # 根據不同的步驟處理
-        if action == 'register':
-            if step == 'register':
-                self.handler.handle_register(reply_token, user_id)
-        elif action == 'edit_profile':
-            if step == 'select_field':
-                self.handler.handle_edit_profile(reply_token, user_id)
-            elif step == 'input':
-                field = parsed_data.get('field', [''])[0]
-                if field:
-                    # 設定修改狀態並提示輸入（可修改：手機、地址、Email）
-                    self.handler.state_service.new_edit_profile_state(user_id, field)
-                    user = self.handler.auth_service.get_user_by_line_id(user_id) if self.handler.auth_service else None
-                    if field == 'phone':
-                        current = user.phone if user and user.phone else '未填寫'
-                        prompt = f"📞 修改手機號碼\n\n目前的手機號碼：{current}\n\n請輸入新的手機號碼（格式：09XX-XXX-XXX 或 09XXXXXXXX）：\n\n或輸入「取消」取消修改。"
-                    elif field == 'address':
-                        current = user.address if user and user.address else '未填寫'
-                        prompt = f"🏠 修改地址\n\n目前的地址：{current}\n\n請輸入新的地址：\n\n或輸入「取消」取消修改。"
-                    elif field == 'email':
-                        current = user.email if user and user.email else '未填寫'
-                        prompt = f"📬 修改 Email\n\n目前的 Email：{current}\n\n請輸入新的 Email：\n\n（可選，輸入「跳過」可清除 Email）\n或輸入「取消」取消修改。"
-                    else:
-                        prompt = "請輸入新值："
-                    
-                    self.handler.message_service.send_text(reply_token, prompt)
-        elif action == 'view_profile':
-            if step == 'view':
-                self.handler.show_user_profile(reply_token, user_id)
-        elif action == 'delete_registration':
-            if step == 'confirm':
-                self.handler.handle_delete_registration(reply_token, user_id)
-            elif step == 'confirm_delete':
-                self.handler.handle_confirm_delete_registration(reply_token, user_id)
-        elif action == 'job':
-            if step == 'list':
-                self.handler.show_available_jobs(reply_token, user_id)
-            elif step == 'detail':
-                if job_id:
-                    self.handler.show_job_detail(reply_token, user_id, job_id)
-            elif step == 'apply':
-                if job_id:
-                    self.handler.handle_apply_job(reply_token, user_id, job_id)
-            elif step == 'select_shift':
-                if job_id and shift:
-                    self.handler.handle_select_shift(reply_token, user_id, job_id, shift)
-            elif step == 'cancel':
-                if job_id:
-                    self.handler.handle_cancel_application(reply_token, user_id, job_id)
-            elif step == 'confirm_cancel':
-                if job_id:
-                    self.handler.handle_confirm_cancel(reply_token, user_id, job_id)
-            elif step == 'my_applications':
-                self.handler.show_user_applications(reply_token, user_id)
-            elif step == 'menu':
-                self.handler.show_main_menu(reply_token, user_id)
+        # 根據 (action, step) 查表處理
+        entry = self._postback_table.get((action, step))
+        if entry is None:
+            return
+        
+        handler_func, param_names = entry
+        params = [parsed_data.get(name, '') for name in param_names]
+        if all(params):
+            handler_func(reply_token, user_id, *params)
+    
+    def _handle_edit_profile_input_prompt(self, reply_token: str, user_id: str, field: str) -> None:
+        """設定修改狀態並提示輸入（可修改：手機、地址、Email）"""
+        self.handler.state_service.new_edit_profile_state(user_id, field)
+        template = _EDIT_PROMPTS.get(field)
+        if template:
+            # 只有可修改的欄位才需要查詢使用者目前的值
+            user = self.handler.auth_service.get_user_by_line_id(user_id) if self.handler.auth_service else None
+            current = (getattr(user, field, None) if user else None) or '未填寫'
+            prompt = template.format(current=current)
+        else:
+            prompt = "請輸入新值："
+        
+        self.handler.message_service.send_text(reply_token, prompt)
     
     def run(self, port: int = 3000, debug: bool = False, use_threading: bool = True, use_gunicorn: Optional[bool] = None):
         """
@@ -287,8 +462,6 @@ class PartTimeJobBot:
             use_threading: 是否使用執行緒在背景執行
             use_gunicorn: 是否使用 Gunicorn（None 時根據環境自動判斷）
         """
-        import os
-        
         # 自動判斷是否使用 Gunicorn
         if use_gunicorn is None:
             # 如果設置了 USE_GUNICORN 環境變數，使用它
@@ -300,28 +473,19 @@ class PartTimeJobBot:
         # 如果使用 Gunicorn
         if use_gunicorn:
             try:
+                # Gunicorn 為選用依賴，僅在需要時載入
                 import gunicorn.app.wsgiapp as wsgi
-                import sys
-                
-                # 確保 Flask 應用程式已註冊報班帳號
-                global flask_app
-                flask_app = self.flask_app
                 
                 # 配置 Gunicorn logger 使用統一的日誌格式
                 setup_gunicorn_logger()
                 
                 # 設置 Gunicorn 參數
                 workers = os.getenv("GUNICORN_WORKERS", "2")
+                # Webhook 以等待 LINE API / 資料庫 I/O 為主，預設使用 gthread 提高每個 worker 的併發
+                worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
                 # Gunicorn 使用小寫的日誌級別，需要轉換
                 app_log_level = os.getenv("LOG_LEVEL", "DEBUG").upper()
-                gunicorn_log_level_map = {
-                    "DEBUG": "debug",
-                    "INFO": "info",
-                    "WARNING": "warning",
-                    "ERROR": "error",
-                    "CRITICAL": "critical"
-                }
-                log_level = gunicorn_log_level_map.get(app_log_level, "info")
+                log_level = GUNICORN_LOG_LEVELS.get(app_log_level, "info")
                 
                 # 統一的 access log 格式
                 # 從格式中移除 %(t)s（Gunicorn 的默認時間戳 [23/Jan/2026:03:08:36 +0000]）
@@ -332,26 +496,21 @@ class PartTimeJobBot:
                 # 注意：響應時間 %(D)s 是微秒，要轉換為毫秒需要除以 1000，但格式不支持計算
                 access_log_format = '%(s)s %(m)s %(U)s%(q)s - %(D)sμs'
                 
-                # Gunicorn 需要直接引用 Flask 應用程式實例
-                # 使用模組級變數 flask_app
+                # Gunicorn 透過應用程式工廠 create_app() 在每個 worker 各自建立應用程式
+                # （不使用 --preload，避免服務與連線在 fork 前建立並跨進程共用）
                 # 使用配置檔案以確保 on_starting hook 被調用
-                import os as os_module
-                config_path = os_module.path.join(
-                    os_module.path.dirname(os_module.path.dirname(os_module.path.dirname(__file__))),
-                    "gunicorn_config.py"
-                )
                 sys.argv = [
                     "gunicorn",
-                    "--config", config_path,
+                    "--config", GUNICORN_CONFIG_PATH,
                     "--bind", f"0.0.0.0:{port}",
                     "--workers", str(workers),
-                    "--worker-class", "sync",
+                    "--worker-class", worker_class,
+                    "--threads", str(GUNICORN_THREADS),
                     "--timeout", "120",
                     "--error-logfile", "-",
                     "--access-logformat", access_log_format,
                     "--log-level", log_level,
-                    "--preload",
-                    "app.bot.bot:flask_app"
+                    "app.bot.bot:create_app()"
                 ]
                 
                 # 注意：我們移除了 --access-logfile "-"
@@ -361,7 +520,7 @@ class PartTimeJobBot:
                 
                 logger.info(f"使用 Gunicorn 啟動 LINE Bot 伺服器")
                 logger.info(f"監聽地址：0.0.0.0:{port}")
-                logger.info(f"Workers：{workers}")
+                logger.info(f"Workers：{workers}（{worker_class}，每個 worker {GUNICORN_THREADS} 執行緒）")
                 logger.info(f"日誌級別：{log_level}")
                 wsgi.run()
             except ImportError:
@@ -374,15 +533,11 @@ class PartTimeJobBot:
         
         # 如果不使用 Gunicorn（開發模式）
         if not use_gunicorn:
-            import warnings
-            import logging
-            
             # 抑制 Flask 開發伺服器警告（在開發環境中）
             warnings.filterwarnings("ignore", message=".*development server.*")
             logging.getLogger("werkzeug").setLevel(logging.ERROR)
             
             if use_threading:
-                import threading
                 def run_server():
                     self.flask_app.run(host='0.0.0.0', port=port, debug=debug, use_reloader=False, use_debugger=False)
                 
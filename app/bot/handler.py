@@ -3,6 +3,7 @@ LINE Bot 工作事件處理器
 """
 from typing import Dict, Optional, List, Any, Union
 import urllib.parse
+import functools
 import datetime
 import re
 import requests
@@ -13,7 +14,7 @@ from app.services.line_message_service import LineMessageService
 from app.services.auth_service import AuthService
 from app.services.state_service import StateService
 from app.services.rich_menu_service import LineRichMenuService
-from app.models.schemas import Job, Application
+from app.models.schemas import Job, Application, User
 from app.core.logger import setup_logger
 from app.config import REGISTERED_USER_RICH_MENU_ID, UNREGISTERED_USER_RICH_MENU_ID
 
@@ -22,6 +23,191 @@ from email_validator import validate_email as validate_email_address, EmailNotVa
 # 設置 logger
 logger = setup_logger(__name__)
 
+# 修改資料流程的關鍵字（比對前會先 strip().lower()）
+_EDIT_CANCEL_WORDS = frozenset({'取消', 'cancel', '取消修改'})
+_EMAIL_CLEAR_WORDS = frozenset({'跳過', 'skip', '略過', '清除', '清空', ''})
+
+# 手機號碼格式（去除 - 與空白後）：09 開頭共 10 位數字
+_PHONE_RE = re.compile(r'09\d{8}')
+
+# Email 基本形狀（單一 @、無空白、網域含 .）：先以此快速排除明顯錯誤的輸入，
+# 通過後才交給 email_validator 做完整檢查
+_EMAIL_SHAPE_RE = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+
+# 固定不變的按鈕與訊息（模組載入時建立一次，各處直接引用；僅供序列化，請勿修改）
+_REGISTER_ACTION = {
+    "type": "postback",
+    "label": "📝 註冊",
+    "data": "action=register&step=register"
+}
+_REGISTER_ACCOUNT_ACTION = {
+    "type": "postback",
+    "label": "📝 註冊報班帳號",
+    "data": "action=register&step=register"
+}
+_BACK_TO_JOBS_ACTION = {
+    "type": "postback",
+    "label": "🔙 返回可報班工作",
+    "data": "action=job&step=list"
+}
+_PROFILE_ACTIONS_MESSAGE = {
+    "type": "template",
+    "altText": "報班帳號資料操作",
+    "template": {
+        "type": "buttons",
+        "title": "📋 報班帳號",
+        "text": "請選擇操作：",
+        "actions": [
+            {
+                "type": "postback",
+                "label": "✏️ 修改資料",
+                "data": "action=edit_profile&step=select_field"
+            },
+            {
+                "type": "postback",
+                "label": "🗑️ 註銷帳號",
+                "data": "action=delete_registration&step=confirm"
+            },
+            {
+                "type": "postback",
+                "label": "🔙 返回主選單",
+                "data": "action=job&step=menu"
+            }
+        ]
+    }
+}
+_DELETE_REGISTRATION_CONFIRM_ACTIONS = [
+    {
+        "type": "postback",
+        "label": "✅ 確認註銷",
+        "data": "action=delete_registration&step=confirm_delete"
+    },
+    {
+        "type": "postback",
+        "label": "🔙 返回",
+        "data": "action=view_profile&step=view"
+    }
+]
+# 工作列表按鈕的固定欄位（迴圈內以 {**骨架, "data"/"uri": ...} 只補上變動部分）
+_DETAIL_ACTION_BASE = {"type": "postback", "label": "🔍 查看詳情"}
+_CANCEL_ACTION_BASE = {"type": "postback", "label": "🚫 取消報班"}
+_APPLY_ACTION_BASE = {"type": "postback", "label": "📝 報班"}
+_NAV_ACTION_BASE = {"type": "uri", "label": "🧭 導航"}
+_APPLICATIONS_MENU_MESSAGE = {
+    "type": "template",
+    "altText": "操作選單",
+    "template": {
+        "type": "buttons",
+        "text": "請選擇操作：",
+        "actions": [
+            {
+                "type": "postback",
+                "label": "🔙 返回主選單",
+                "data": "action=job&step=menu"
+            },
+            {
+                "type": "postback",
+                "label": "🔍 可報班工作",
+                "data": "action=job&step=list"
+            }
+        ]
+    }
+}
+
+def _main_menu_message(is_registered: bool) -> Dict[str, Any]:
+    """
+    構建主選單訊息（模組載入時依註冊狀態各建立一次）
+    
+    參數:
+        is_registered: 使用者是否已註冊報班帳號
+    
+    返回:
+        主選單按鈕範本訊息
+    """
+    actions = []
+    
+    if not is_registered:
+        # 未註冊報班帳號使用者：顯示註冊報班帳號選項
+        actions.append(_REGISTER_ACCOUNT_ACTION)
+    
+    actions.extend([
+        {
+            "type": "postback",
+            "label": "📋 可報班工作",
+            "data": "action=job&step=list"
+        },
+        {
+            "type": "postback",
+            "label": "🔍 已報班記錄",
+            "data": "action=job&step=my_applications"
+        }
+    ])
+    
+    # 已註冊報班帳號使用者：顯示查看報班帳號資料選項
+    if is_registered:
+        actions.append({
+            "type": "postback",
+            "label": "👤 報班帳號",
+            "data": "action=view_profile&step=view"
+        })
+    
+    actions.append({
+        "type": "message",
+        "label": "📞 聯絡客服",
+        "text": "我需要客服協助"
+    })
+    
+    menu_text = "請選擇您需要的服務："
+    if not is_registered:
+        menu_text = "⚠️ 您尚未註冊報班帳號，請先完成註冊才能報班工作。\n\n" + menu_text
+    
+    return {
+        "type": "template",
+        "altText": "💼 Good Jobs 報班系統",
+        "template": {
+            "type": "buttons",
+            "title": "💼 Good Jobs 報班系統",
+            "text": menu_text,
+            "actions": actions
+        }
+    }
+
+
+# 主選單只有已註冊/未註冊兩種內容，預先建立（僅供序列化，請勿修改）
+_REGISTERED_MAIN_MENU_MESSAGE = _main_menu_message(True)
+_UNREGISTERED_MAIN_MENU_MESSAGE = _main_menu_message(False)
+
+# 已報班記錄一次回覆最多顯示的卡片數（加上標題與操作選單共 5 則，符合 LINE 單次回覆上限）
+_MAX_APPLICATION_CARDS = 3
+
+# Google Maps 導航網址前綴（後接 URL 編碼後的地點）
+_NAV_PREFIX = "https://www.google.com/maps/dir/?api=1&destination="
+
+
+@functools.lru_cache(maxsize=4096)
+def _quote_location(location: str) -> str:
+    """URL 編碼工作地點（同一地點在各列表中重複出現，快取編碼結果）"""
+    return urllib.parse.quote(location)
+
+
+@functools.lru_cache(maxsize=256)
+def _quote_shift(shift: str) -> str:
+    """URL 編碼班別名稱（班別種類有限且各工作共用，快取編碼結果）"""
+    return urllib.parse.quote(shift)
+
+
+def _format_user_profile(user: User) -> str:
+    """組合報班帳號資料文字（查看資料與修改成功後共用）"""
+    return f"""📋 您的報班帳號資料：
+
+• 🧑‍💼 姓名：{user.full_name or '未填寫'}
+• 🎂 生日：{user.birthday or '未填寫'}
+• 📞 手機：{user.phone or '未填寫'}
+• 🏠 地址：{user.address or '未填寫'}
+• 🪪 身份證：{user.id_number or '未填寫'}
+• 📬 Email：{user.email or '未填寫'}
+• 註冊時間：{user.created_at}"""
+
 
 def validate_email(email: str) -> bool:
     """
@@ -33,7 +219,7 @@ def validate_email(email: str) -> bool:
     返回:
         bool: 如果 Email 格式正確返回 True，否則返回 False
     """
-    if not email or not email.strip():
+    if not email or '@' not in email or not _EMAIL_SHAPE_RE.fullmatch(email):
         return False
     
     try:
@@ -119,19 +305,26 @@ class JobHandler:
         self.state_service = state_service or StateService()
         # Rich Menu 服務（用於自動設定用戶的 Rich Menu）
         self.rich_menu_service = rich_menu_service or LineRichMenuService()
+        # 註冊步驟分派表：step -> 處理方法
+        self._reg_steps = {
+            'name': self._reg_step_name,
+            'birthday': self._reg_step_birthday,
+            'phone': self._reg_step_phone,
+            'address': self._reg_step_address,
+            'id_number': self._reg_step_id_number,
+            'email': self._reg_step_email,
+        }
     
     def show_available_jobs(self, reply_token: str, user_id: Optional[str] = None) -> None:
         """顯示可報班的可報班工作（使用輪播方式，按日期升序排序），排除使用者已報班的日期"""
         jobs = self.job_service.get_available_jobs()
         
         # 排除使用者已報班的日期：若該日已有任一報班記錄，該日期的所有工作都不顯示
+        applications = []
         if user_id:
             applications = self.application_service.get_user_applications(user_id)
-            applied_dates = set()
-            for app in applications:
-                job = self.job_service.get_job(app.job_id)
-                if job and job.date:
-                    applied_dates.add(job.date)
+            applied_jobs = self.job_service.get_jobs_bulk(app.job_id for app in applications)
+            applied_dates = {job.date for job in applied_jobs.values() if job.date}
             if applied_dates:
                 jobs = [j for j in jobs if j.date not in applied_dates]
                 logger.info(f"排除已報班日期 {applied_dates}，剩餘 {len(jobs)} 個可報班工作")
@@ -178,6 +371,16 @@ class JobHandler:
                 "text": f"📋 可報班的工作（共 {len(jobs)} 個）："
             })
         
+        # 使用者的報班記錄依工作 ID 索引（沿用上方已查詢的結果，不再逐一查詢；同一工作保留最新一筆）
+        applications_by_job: Dict[str, Application] = {}
+        for app in applications:
+            applications_by_job.setdefault(app.job_id, app)
+        
+        # 檢查使用者是否已註冊報班帳號（與工作無關，迴圈外只查一次）
+        is_registered = True
+        if self.auth_service:
+            is_registered = self.auth_service.is_line_user_registered(user_id) if user_id else False
+        
         # 建立輪播 columns
         columns = []
         for job in display_jobs:
@@ -188,55 +391,28 @@ class JobHandler:
                 is_applied = False
                 applied_shift = None
                 if user_id:
-                    application = self.application_service.get_user_application_for_job(user_id, job.id)
+                    application = applications_by_job.get(job.id)
                     if application:
                         is_applied = True
                         applied_shift = application.shift
                 
                 # 建立 Google Maps 導航 URL
-                encoded_location = urllib.parse.quote(job.location)
-                navigation_url = f"https://www.google.com/maps/dir/?api=1&destination={encoded_location}"
-                
-                # 檢查使用者是否已註冊報班帳號
-                is_registered = True
-                if self.auth_service:
-                    is_registered = self.auth_service.is_line_user_registered(user_id) if user_id else False
+                encoded_location = _quote_location(job.location)
+                navigation_url = _NAV_PREFIX + encoded_location
                 
                 # 建立按鈕動作（Carousel 每個 bubble 最多 3 個按鈕）
-                actions = [
-                    {
-                        "type": "postback",
-                        "label": "🔍 查看詳情",
-                        "data": f"action=job&step=detail&job_id={job.id}"
-                    }
-                ]
+                actions = [{**_DETAIL_ACTION_BASE, "data": f"action=job&step=detail&job_id={job.id}"}]
                 
                 # 根據狀態加入第二個按鈕
                 if not is_registered:
-                    actions.append({
-                        "type": "postback",
-                        "label": "📝 註冊",
-                        "data": "action=register&step=register"
-                    })
+                    actions.append(_REGISTER_ACTION)
                 elif is_applied:
-                    actions.append({
-                        "type": "postback",
-                        "label": "🚫 取消報班",
-                        "data": f"action=job&step=cancel&job_id={job.id}"
-                    })
+                    actions.append({**_CANCEL_ACTION_BASE, "data": f"action=job&step=cancel&job_id={job.id}"})
                 else:
-                    actions.append({
-                        "type": "postback",
-                        "label": "📝 報班",
-                        "data": f"action=job&step=apply&job_id={job.id}"
-                    })
+                    actions.append({**_APPLY_ACTION_BASE, "data": f"action=job&step=apply&job_id={job.id}"})
                 
                 # 加入導航按鈕（第三個）
-                actions.append({
-                    "type": "uri",
-                    "label": "🧭 導航",
-                    "uri": navigation_url
-                })
+                actions.append({**_NAV_ACTION_BASE, "uri": navigation_url})
                 
                 # 建立文字內容（Carousel text 最多 120 字元，但建議 60 字元以內）
                 # 簡化地點顯示
@@ -263,21 +439,21 @@ class JobHandler:
                 else:
                     status_text = "⭕未報班"
                 
-                # 組合文字內容（最多 120 字元）
-                job_text = f"🏠{location_display}\n📅{job.date or '未指定日期'}\n⏰{shifts_display}\n{status_text}"
-                
-                # 確保文字不超過 120 字元
-                if len(job_text) > 120:
+                # 組合文字內容（最多 120 字元）：先以長度計算決定各欄位，只組字串一次
+                date_display = job.date or '未指定日期'
+                # 固定部分：地點 + 日期 + 狀態 + 3 個圖示 + 3 個換行
+                fixed_length = len(location_display) + len(date_display) + len(status_text) + 6
+                if fixed_length + len(shifts_display) > 120:
                     # 簡化班別顯示
                     if len(shifts) > 1:
                         shifts_display = f"{len(shifts)}個班別"
                     else:
                         shifts_display = shifts[0][:15] if shifts else "未指定"
-                    job_text = f"🏠{location_display}\n📅{job.date or '未指定日期'}\n⏰{shifts_display}\n{status_text}"
                     
                     # 如果還是太長，進一步簡化
-                    if len(job_text) > 120:
-                        job_text = f"🏠{location_display[:15]}\n📅{job.date or '未指定日期'}\n⏰{shifts_display}\n{status_text}"
+                    if fixed_length + len(shifts_display) > 120:
+                        location_display = location_display[:15]
+                job_text = f"🏠{location_display}\n📅{date_display}\n⏰{shifts_display}\n{status_text}"
                 
                 # 建立 Carousel column
                 column = {
@@ -346,32 +522,25 @@ class JobHandler:
             application = self.application_service.get_user_application_for_job(user_id, job_id)
             is_applied = application is not None
         
-        # 建立工作詳情訊息
+        # 建立工作詳情訊息（班別列表一次 join，避免逐行串接字串）
+        shifts_lines = "".join(f"   • {shift}\n" for shift in job.shifts)
+        applied_line = f"\n✅ 您已報班：{application.shift}" if is_applied and application else ""
         job_detail = f"""📌 {job.name}
 
 🏠 工作地點：{job.location}
 📅 工作日期：{job.date}
 ⏰ 可選班別：
-"""
-        for shift in job.shifts:
-            job_detail += f"   • {shift}\n"
-        
-        if is_applied and application:
-            job_detail += f"\n✅ 您已報班：{application.shift}"
+{shifts_lines}{applied_line}"""
         
         # 建立 Google Maps 導航 URL
-        encoded_location = urllib.parse.quote(job.location)
-        navigation_url = f"https://www.google.com/maps/dir/?api=1&destination={encoded_location}"
+        encoded_location = _quote_location(job.location)
+        navigation_url = _NAV_PREFIX + encoded_location
         
         # 建立按鈕
         actions = []
         if not is_registered:
             # 未註冊報班帳號使用者：顯示註冊報班帳號按鈕
-            actions.append({
-                "type": "postback",
-                "label": "📝 註冊報班帳號",
-                "data": "action=register&step=register"
-            })
+            actions.append(_REGISTER_ACCOUNT_ACTION)
         elif is_applied:
             actions.append({
                 "type": "postback",
@@ -392,11 +561,7 @@ class JobHandler:
             "uri": navigation_url
         })
         
-        actions.append({
-            "type": "postback",
-            "label": "🔙 返回可報班工作",
-            "data": "action=job&step=list"
-        })
+        actions.append(_BACK_TO_JOBS_ACTION)
         
         messages = []
         
@@ -456,7 +621,7 @@ class JobHandler:
             shift_actions.append({
                 "type": "postback",
                 "label": f"📅 {shift}",
-                "data": f"action=job&step=select_shift&job_id={job_id}&shift={urllib.parse.quote(shift)}"
+                "data": f"action=job&step=select_shift&job_id={job_id}&shift={_quote_shift(shift)}"
             })
         
         messages = [
@@ -606,7 +771,8 @@ class JobHandler:
     
     def show_user_applications(self, reply_token: str, user_id: str) -> None:
         """顯示使用者已報班的可報班工作"""
-        applications = self.application_service.get_user_applications(user_id)
+        # 單一查詢取得報班記錄及其對應工作
+        applications = self.application_service.get_user_applications_with_jobs(user_id)
         
         if not applications:
             self.message_service.send_text(
@@ -616,16 +782,23 @@ class JobHandler:
             return
         
         # 建立報班列表訊息
+        # LINE 單次回覆最多 5 則訊息：標題 + 最多 3 張報班卡片 + 操作選單
+        header_text = f"📋 您的報班記錄（共 {len(applications)} 筆）："
+        if len(applications) > _MAX_APPLICATION_CARDS:
+            header_text = f"📋 您的報班記錄（共 {len(applications)} 筆，僅顯示前 {_MAX_APPLICATION_CARDS} 筆）："
         messages = []
         messages.append({
             "type": "text",
-            "text": f"📋 您的報班記錄（共 {len(applications)} 筆）："
+            "text": header_text
         })
         
+        # 檢查使用者是否已註冊報班帳號（迴圈外只查一次）
+        is_registered = True
+        if self.auth_service:
+            is_registered = self.auth_service.is_line_user_registered(user_id)
+        
         # 每個報班建立一個訊息卡片
-        for i, app in enumerate(applications, 1):
-            job = self.job_service.get_job(app.job_id)
-            
+        for i, (app, job) in enumerate(applications[:_MAX_APPLICATION_CARDS], 1):
             if not job:
                 # 如果工作不存在，只顯示報班資訊
                 app_text = f"{i}. 報班編號：{app.id}\n   班別：{app.shift}\n   報班時間：{app.applied_at}\n   ⚠️ 工作已不存在"
@@ -656,28 +829,20 @@ class JobHandler:
                 app_id_display = app.id[-12:] if len(app.id) > 12 else app.id
             
             # 簡化報班時間（只顯示日期）
-            applied_date = app.applied_at.split()[0] if " " in app.applied_at else app.applied_at
+            applied_date = app.applied_at[:10] if len(app.applied_at) >= 10 and app.applied_at[4] == '-' else app.applied_at
             
-            # 建立文字，逐步檢查長度
+            # 建立文字（不超過 60 字元）：依剩餘長度決定是否加入報班編號與報班時間
             app_text = f"📌{job_name_display}\n🏠{location_display}\n📅{job.date}\n⏰{app.shift}"
-            
-            # 如果還有空間，加入報班編號
-            test_text = app_text + f"\n。🏷️{app_id_display}"
-            if len(test_text) <= 60:
-                app_text = test_text
-                # 如果還有更多空間，加入報班時間
-                test_text = app_text + f"\n📝{applied_date}"
-                if len(test_text) <= 60:
-                    app_text = test_text
+            id_line = f"\n。🏷️{app_id_display}"
+            if len(app_text) + len(id_line) <= 60:
+                app_text += id_line
+                date_line = f"\n📝{applied_date}"
+                if len(app_text) + len(date_line) <= 60:
+                    app_text += date_line
             
             # 建立 Google Maps 導航 URL
-            encoded_location = urllib.parse.quote(job.location)
-            navigation_url = f"https://www.google.com/maps/dir/?api=1&destination={encoded_location}"
-            
-            # 檢查使用者是否已註冊報班帳號
-            is_registered = True
-            if self.auth_service:
-                is_registered = self.auth_service.is_line_user_registered(user_id)
+            encoded_location = _quote_location(job.location)
+            navigation_url = _NAV_PREFIX + encoded_location
             
             # 建立按鈕動作
             actions = [
@@ -702,11 +867,7 @@ class JobHandler:
                     }
                 ])
             else:
-                actions.append({
-                    "type": "postback",
-                    "label": "📝 註冊報班帳號",
-                    "data": "action=register&step=register"
-                })
+                actions.append(_REGISTER_ACCOUNT_ACTION)
             
             # 建立按鈕範本
             template = {
@@ -728,26 +889,7 @@ class JobHandler:
         
         # 如果報班記錄很多，加入返回按鈕
         if len(applications) > 1:
-            messages.append({
-                "type": "template",
-                "altText": "操作選單",
-                "template": {
-                    "type": "buttons",
-                    "text": "請選擇操作：",
-                    "actions": [
-                        {
-                            "type": "postback",
-                            "label": "🔙 返回主選單",
-                            "data": "action=job&step=menu"
-                        },
-                        {
-                            "type": "postback",
-                            "label": "🔍 可報班工作",
-                            "data": "action=job&step=list"
-                        }
-                    ]
-                }
-            })
+            messages.append(_APPLICATIONS_MENU_MESSAGE)
         
         self.message_service.send_multiple_messages(reply_token, messages)
         
@@ -788,7 +930,7 @@ class JobHandler:
         )
         
     def _handle_register_complete(self, reply_token: str, user_id: str, data: dict) -> None:
-        logger.debug(f"_create_line_user: data: {data} (user_id: {user_id})")
+        logger.debug("_create_line_user: 欄位: %s (user_id: %s)", list(data), user_id)
         # 完成註冊報班帳號
         try:
             # 取得並驗證必填欄位
@@ -913,7 +1055,7 @@ class JobHandler:
                     "type": "text",
                     "text": success_message
                 },
-                self._build_main_menu_message(user_id)  # 使用輔助方法構建主選單
+                _REGISTERED_MAIN_MENU_MESSAGE  # 剛完成註冊，直接使用已註冊使用者的主選單
             ]
             
             self.message_service.send_multiple_messages(reply_token, messages)
@@ -933,135 +1075,149 @@ class JobHandler:
 
         state = self.state_service.get_registration_state(user_id)
         if state is None:
-            logger.debug(f"handle_register_input: user_id: {user_id} not in registration_states")
+            logger.debug("handle_register_input: user_id: %s not in registration_states", user_id)
             return
         
         step = state.get('step', None)
         if step is None:
-            logger.debug(f"handle_register_input: user_id: {user_id} state missing 'step' key")
+            logger.debug("handle_register_input: user_id: %s state missing 'step' key", user_id)
             return
         
-        logger.debug(f"handle_register_input: step: {step} (data: {state['data']}) (user_id: {user_id})")
-        if step == 'name':
-            # 儲存姓名（至少二個中文字），進入下一步
-            name = text.strip()
-            if not name:
-                self.message_service.send_text(
-                    reply_token,
-                    "❌ 姓名不能為空，請重新輸入。"
-                )
-                return
-            if not validate_name_at_least_two_chinese(name):
-                self.message_service.send_text(
-                    reply_token,
-                    "❌ 姓名至少需包含二個中文字，請重新輸入。"
-                )
-                return
-            state['data']['full_name'] = name
-            self.state_service.update_registration_state(user_id, step='birthday', data=state['data'])
-            logger.debug(f"Set registration_states: new step: birthday (data: {state['data']}) (user_id: {user_id})")
-            # 使用 date picker 選擇生日（範圍：今天-65年 ～ 今天-15年）
-            today = datetime.date.today()
-            min_birthday = today.replace(year=today.year - 65)
-            max_birthday = today.replace(year=today.year - 15)
-            picker_action = {
-                "type": "datetimepicker",
-                "label": "選擇生日",
-                "data": "action=register&step=birthday",
-                "mode": "date",
-                "min": min_birthday.isoformat(),
-                "max": max_birthday.isoformat()
-            }
-            messages = [
-                {"type": "text", "text": f"✅ 姓名已記錄：{name}\n\n🎂 第二步：請點下方按鈕選擇生日"},
-                {
-                    "type": "template",
-                    "altText": "選擇生日",
-                    "template": {
-                        "type": "buttons",
-                        "title": "選擇生日",
-                        "text": "請點下方按鈕選擇您的生日（西元）",
-                        "actions": [picker_action]
-                    }
+        # 註冊資料字典只取一次，各步驟直接寫入
+        data = state['data']
+        logger.debug("handle_register_input: step: %s (已填欄位: %s) (user_id: %s)", step, list(data), user_id)
+        reg_step = self._reg_steps.get(step)
+        if reg_step is None:
+            logger.debug("handle_register_input: 未知的註冊步驟 %s (user_id: %s)", step, user_id)
+            return
+        reg_step(reply_token, user_id, text, data)
+
+    def _reg_step_name(self, reply_token: str, user_id: str, text: str, data: Dict[str, Any]) -> None:
+        """註冊步驟：姓名"""
+        # 儲存姓名（至少二個中文字），進入下一步
+        name = text.strip()
+        if not name:
+            self.message_service.send_text(
+                reply_token,
+                "❌ 姓名不能為空，請重新輸入。"
+            )
+            return
+        if not validate_name_at_least_two_chinese(name):
+            self.message_service.send_text(
+                reply_token,
+                "❌ 姓名至少需包含二個中文字，請重新輸入。"
+            )
+            return
+        data['full_name'] = name
+        self.state_service.update_registration_state(user_id, step='birthday', data=data)
+        logger.debug("Set registration_states: new step: birthday (user_id: %s)", user_id)
+        # 使用 date picker 選擇生日（範圍：今天-65年 ～ 今天-15年）
+        today = datetime.date.today()
+        min_birthday = today.replace(year=today.year - 65)
+        max_birthday = today.replace(year=today.year - 15)
+        picker_action = {
+            "type": "datetimepicker",
+            "label": "選擇生日",
+            "data": "action=register&step=birthday",
+            "mode": "date",
+            "min": min_birthday.isoformat(),
+            "max": max_birthday.isoformat()
+        }
+        messages = [
+            {"type": "text", "text": f"✅ 姓名已記錄：{name}\n\n🎂 第二步：請點下方按鈕選擇生日"},
+            {
+                "type": "template",
+                "altText": "選擇生日",
+                "template": {
+                    "type": "buttons",
+                    "title": "選擇生日",
+                    "text": "請點下方按鈕選擇您的生日（西元）",
+                    "actions": [picker_action]
                 }
-            ]
-            self.message_service.send_multiple_messages(reply_token, messages)
+            }
+        ]
+        self.message_service.send_multiple_messages(reply_token, messages)
 
-        elif step == 'birthday':
-            # 若使用者用文字輸入生日（date picker 以外的備援）
-            raw = text.strip()
-            if not validate_birthday_iso(raw):
-                self.message_service.send_text(
-                    reply_token,
-                    "❌ 生日格式不正確，請點下方按鈕選擇生日，或使用西元 YYYY-MM-DD（例：1990-01-15）。"
-                )
-                return
-            state['data']['birthday'] = raw
-            self.state_service.update_registration_state(user_id, step='phone', data=state['data'])
+    def _reg_step_birthday(self, reply_token: str, user_id: str, text: str, data: Dict[str, Any]) -> None:
+        """註冊步驟：生日（文字輸入備援）"""
+        # 若使用者用文字輸入生日（date picker 以外的備援）
+        raw = text.strip()
+        if not validate_birthday_iso(raw):
             self.message_service.send_text(
                 reply_token,
-                f"✅ 生日已記錄：{raw}\n\n📞 第三步：請輸入您的手機號碼（格式：09XX-XXX-XXX 或 09XXXXXXXX）"
+                "❌ 生日格式不正確，請點下方按鈕選擇生日，或使用西元 YYYY-MM-DD（例：1990-01-15）。"
             )
-        
-        elif step == 'phone':
-            # 驗證並儲存手機號碼
-            phone = text.strip().replace('-', '').replace(' ', '')
-            if not phone.isdigit() or len(phone) != 10 or not phone.startswith('09'):
-                self.message_service.send_text(
-                    reply_token,
-                    "❌ 手機號碼格式不正確，請輸入 10 位數手機（例如：0912345678）。"
-                )
-                return
-            
-            state['data']['phone'] = phone
-            self.state_service.update_registration_state(user_id, step='address', data=state['data'])
+            return
+        data['birthday'] = raw
+        self.state_service.update_registration_state(user_id, step='phone', data=data)
+        self.message_service.send_text(
+            reply_token,
+            f"✅ 生日已記錄：{raw}\n\n📞 第三步：請輸入您的手機號碼（格式：09XX-XXX-XXX 或 09XXXXXXXX）"
+        )
+
+    def _reg_step_phone(self, reply_token: str, user_id: str, text: str, data: Dict[str, Any]) -> None:
+        """註冊步驟：手機號碼"""
+        # 驗證並儲存手機號碼
+        phone = text.strip().replace('-', '').replace(' ', '')
+        if not _PHONE_RE.fullmatch(phone):
             self.message_service.send_text(
                 reply_token,
-                f"✅ 手機號碼已記錄：{phone}\n\n🏠 第四步：請輸入您的地址"
+                "❌ 手機號碼格式不正確，請輸入 10 位數手機（例如：0912345678）。"
             )
+            return
         
-        elif step == 'address':
-            address = text.strip()
-            if not address:
-                self.message_service.send_text(
-                    reply_token,
-                    "❌ 地址不能為空，請重新輸入。"
-                )
-                return
-            state['data']['address'] = address
-            self.state_service.update_registration_state(user_id, step='id_number', data=state['data'])
+        data['phone'] = phone
+        self.state_service.update_registration_state(user_id, step='address', data=data)
+        self.message_service.send_text(
+            reply_token,
+            f"✅ 手機號碼已記錄：{phone}\n\n🏠 第四步：請輸入您的地址"
+        )
+
+    def _reg_step_address(self, reply_token: str, user_id: str, text: str, data: Dict[str, Any]) -> None:
+        """註冊步驟：地址"""
+        address = text.strip()
+        if not address:
             self.message_service.send_text(
                 reply_token,
-                f"✅ 地址已記錄：{address}\n\n🪪 第五步：請輸入您的身份證字號（台灣身份證格式）"
+                "❌ 地址不能為空，請重新輸入。"
             )
+            return
+        data['address'] = address
+        self.state_service.update_registration_state(user_id, step='id_number', data=data)
+        self.message_service.send_text(
+            reply_token,
+            f"✅ 地址已記錄：{address}\n\n🪪 第五步：請輸入您的身份證字號（台灣身份證格式）"
+        )
 
-        elif step == 'id_number':
-            # 驗證並儲存台灣身份證字號
-            id_str = text.strip().upper().replace(' ', '')
-            if not validate_taiwan_id(id_str):
-                self.message_service.send_text(
-                    reply_token,
-                    "❌ 身份證字號格式或檢核不符，請輸入正確的台灣身份證字號（一碼英文+九碼數字）。"
-                )
-                return
-            state['data']['id_number'] = id_str
-            self.state_service.update_registration_state(user_id, step='email', data=state['data'])
+    def _reg_step_id_number(self, reply_token: str, user_id: str, text: str, data: Dict[str, Any]) -> None:
+        """註冊步驟：身份證字號"""
+        # 驗證並儲存台灣身份證字號
+        id_str = text.strip().upper().replace(' ', '')
+        if not validate_taiwan_id(id_str):
             self.message_service.send_text(
                 reply_token,
-                f"✅ 身份證已記錄\n\n📬 第六步：請輸入您的 E-mail（須可收信）"
+                "❌ 身份證字號格式或檢核不符，請輸入正確的台灣身份證字號（一碼英文+九碼數字）。"
             )
-        
-        elif step == 'email':
-            email = text.strip()
-            if not validate_email(email):
-                self.message_service.send_text(
-                    reply_token,
-                    "❌ E-mail 格式不正確，請重新輸入。"
-                )
-                return
-            state['data']['email'] = email
-            self.state_service.update_registration_state(user_id, data=state['data'])
-            self._handle_register_complete(reply_token, user_id, state['data'])
+            return
+        data['id_number'] = id_str
+        self.state_service.update_registration_state(user_id, step='email', data=data)
+        self.message_service.send_text(
+            reply_token,
+            f"✅ 身份證已記錄\n\n📬 第六步：請輸入您的 E-mail（須可收信）"
+        )
+
+    def _reg_step_email(self, reply_token: str, user_id: str, text: str, data: Dict[str, Any]) -> None:
+        """註冊步驟：E-mail"""
+        email = text.strip()
+        if not validate_email(email):
+            self.message_service.send_text(
+                reply_token,
+                "❌ E-mail 格式不正確，請重新輸入。"
+            )
+            return
+        data['email'] = email
+        self.state_service.update_registration_state(user_id, data=data)
+        self._handle_register_complete(reply_token, user_id, data)
 
     def handle_register_birthday_picked(self, reply_token: str, user_id: str, date_str: str) -> None:
         """處理註冊流程中由 date picker 選擇的生日"""
@@ -1149,8 +1305,11 @@ class JobHandler:
         if state is None:
             return
         
+        # 只去除一次前後空白，後續判斷與各欄位共用
+        text = text.strip()
+        
         # 檢查是否要取消修改
-        if text.strip().lower() in ['取消', 'cancel', '取消修改']:
+        if text.lower() in _EDIT_CANCEL_WORDS:
             self.state_service.delete_edit_profile_state(user_id)
             self.message_service.send_text(
                 reply_token,
@@ -1162,40 +1321,21 @@ class JobHandler:
         
         if field == 'phone':
             # 驗證並更新手機號碼
-            phone = text.strip().replace('-', '').replace(' ', '')
-            if not phone.isdigit() or len(phone) != 10 or not phone.startswith('09'):
+            phone = text.replace('-', '').replace(' ', '')
+            if not _PHONE_RE.fullmatch(phone):
                 self.message_service.send_text(
                     reply_token,
                     "❌ 手機號碼格式不正確，請輸入10位數手機號碼（例如：0912345678）\n\n或輸入「取消」取消修改。"
                 )
                 return
             
-            # 更新資料
-            user = self.auth_service.get_user_by_line_id(user_id)
-            if user:
-                self.auth_service.create_line_user(
-                    line_user_id=user_id,
-                    full_name=user.full_name,
-                    birthday=user.birthday,
-                    phone=phone,
-                    address=user.address,
-                    id_number=user.id_number,
-                    email=user.email
-                )
-                
-                # 清除修改狀態
-                self.state_service.delete_edit_profile_state(user_id)
-                
-                # 發送成功訊息並返回查看報班帳號資料頁面
-                success_message = f"✅ 手機號碼已更新為：{phone}"
-                self._send_update_success_and_show_profile(reply_token, user_id, success_message)
-            else:
-                self.state_service.delete_edit_profile_state(user_id)
-                self.message_service.send_text(reply_token, "❌ 找不到您的帳號資訊。")
+            # 只更新變動的欄位（單次讀寫，不需先取得使用者再整筆覆寫）
+            updated_user = self.auth_service.update_line_user(user_id, phone=phone)
+            success_message = f"✅ 手機號碼已更新為：{phone}"
         
         elif field == 'address':
             # 更新地址
-            address = text.strip()
+            address = text
             if not address:
                 self.message_service.send_text(
                     reply_token,
@@ -1203,34 +1343,16 @@ class JobHandler:
                 )
                 return
             
-            # 更新資料
-            user = self.auth_service.get_user_by_line_id(user_id)
-            if user:
-                self.auth_service.create_line_user(
-                    line_user_id=user_id,
-                    full_name=user.full_name,
-                    birthday=user.birthday,
-                    phone=user.phone,
-                    address=address,
-                    id_number=user.id_number,
-                    email=user.email
-                )
-                
-                # 清除修改狀態
-                self.state_service.delete_edit_profile_state(user_id)
-                
-                # 發送成功訊息並返回查看報班帳號資料頁面
-                success_message = f"✅ 地址已更新為：{address}"
-                self._send_update_success_and_show_profile(reply_token, user_id, success_message)
-            else:
-                self.state_service.delete_edit_profile_state(user_id)
-                self.message_service.send_text(reply_token, "❌ 找不到您的帳號資訊。")
+            updated_user = self.auth_service.update_line_user(user_id, address=address)
+            success_message = f"✅ 地址已更新為：{address}"
         
         elif field == 'email':
             # 更新 Email
-            email = text.strip()
-            if email.lower() in ['跳過', 'skip', '略過', '清除', '清空', '']:
-                email = None
+            email = text
+            if email.lower() in _EMAIL_CLEAR_WORDS:
+                # 空字串表示清除 Email
+                updated_user = self.auth_service.update_line_user(user_id, email='')
+                success_message = "✅ Email 已清除。"
             else:
                 if not validate_email(email):
                     self.message_service.send_text(
@@ -1238,71 +1360,26 @@ class JobHandler:
                         "❌ Email 格式不正確，請重新輸入或輸入「跳過」清除 Email。"
                     )
                     return
-            
-            # 更新資料
-            user = self.auth_service.get_user_by_line_id(user_id)
-            if user:
-                self.auth_service.create_line_user(
-                    line_user_id=user_id,
-                    full_name=user.full_name,
-                    birthday=user.birthday,
-                    phone=user.phone,
-                    address=user.address,
-                    id_number=user.id_number,
-                    email=email
-                )
-                
-                # 清除修改狀態
-                self.state_service.delete_edit_profile_state(user_id)
-                
-                # 發送成功訊息並返回查看報班帳號資料頁面
-                if email:
-                    success_message = f"✅ Email 已更新為：{email}"
-                else:
-                    success_message = "✅ Email 已清除。"
-                self._send_update_success_and_show_profile(reply_token, user_id, success_message)
-            else:
-                self.state_service.delete_edit_profile_state(user_id)
-                self.message_service.send_text(reply_token, "❌ 找不到您的帳號資訊。")
-    
-    def _send_update_success_and_show_profile(self, reply_token: str, user_id: str, success_message: str) -> None:
-        """發送更新成功訊息並顯示報班帳號資料頁面"""
-        # 取得更新後的使用者資料
-        user = self.auth_service.get_user_by_line_id(user_id) if self.auth_service else None
-        if not user:
-            # 如果無法取得使用者資料，只發送成功訊息
-            self.message_service.send_text(reply_token, success_message)
+                updated_user = self.auth_service.update_line_user(user_id, email=email)
+                success_message = f"✅ Email 已更新為：{email}"
+        
+        else:
             return
         
-        # 顯示更新後的報班帳號資料
-        user_info = f"""📋 您的報班帳號資料：
-
-• 🧑‍💼 姓名：{user.full_name or '未填寫'}
-• 🎂 生日：{user.birthday or '未填寫'}
-• 📞 手機：{user.phone or '未填寫'}
-• 🏠 地址：{user.address or '未填寫'}
-• 🪪 身份證：{user.id_number or '未填寫'}
-• 📬 Email：{user.email or '未填寫'}
-• 註冊時間：{user.created_at}"""
+        # 清除修改狀態
+        self.state_service.delete_edit_profile_state(user_id)
         
-        # 準備操作按鈕
-        actions = [
-            {
-                "type": "postback",
-                "label": "✏️ 修改資料",
-                "data": "action=edit_profile&step=select_field"
-            },
-            {
-                "type": "postback",
-                "label": "🗑️ 註銷帳號",
-                "data": "action=delete_registration&step=confirm"
-            },
-            {
-                "type": "postback",
-                "label": "🔙 返回主選單",
-                "data": "action=job&step=menu"
-            }
-        ]
+        if not updated_user:
+            self.message_service.send_text(reply_token, "❌ 找不到您的帳號資訊。")
+            return
+        
+        # 發送成功訊息並返回查看報班帳號資料頁面
+        self._send_update_success_and_show_profile(reply_token, updated_user, success_message)
+    
+    def _send_update_success_and_show_profile(self, reply_token: str, user: User, success_message: str) -> None:
+        """發送更新成功訊息並顯示報班帳號資料頁面（user 為更新後的使用者資料）"""
+        # 顯示更新後的報班帳號資料
+        user_info = _format_user_profile(user)
         
         # 使用 send_multiple_messages 在同一個回覆中發送成功訊息、更新後的資料和操作按鈕
         messages = [
@@ -1314,16 +1391,7 @@ class JobHandler:
                 "type": "text",
                 "text": user_info
             },
-            {
-                "type": "template",
-                "altText": "報班帳號資料操作",
-                "template": {
-                    "type": "buttons",
-                    "title": "📋 報班帳號",
-                    "text": "請選擇操作：",
-                    "actions": actions
-                }
-            }
+            _PROFILE_ACTIONS_MESSAGE
         ]
         
         try:
@@ -1357,24 +1425,11 @@ class JobHandler:
         # 使用簡潔版本
         confirm_text = "⚠️ 確認註銷報班帳號\n\n取消後將無法報班工作，且無法復原。\n\n確定要取消嗎？"
         
-        actions = [
-            {
-                "type": "postback",
-                "label": "✅ 確認註銷",
-                "data": "action=delete_registration&step=confirm_delete"
-            },
-            {
-                "type": "postback",
-                "label": "🔙 返回",
-                "data": "action=view_profile&step=view"
-            }
-        ]
-        
         self.message_service.send_buttons_template(
             reply_token,
             "🗑️ 註銷報班帳號",
             confirm_text,
-            actions
+            _DELETE_REGISTRATION_CONFIRM_ACTIONS
         )
     
     def handle_confirm_delete_registration(self, reply_token: str, user_id: str) -> None:
@@ -1391,15 +1446,10 @@ class JobHandler:
             )
             return
         
-        # 取消使用者註冊報班帳號
-        success = self.auth_service.delete_line_user(user_id)
+        # 取消使用者註冊報班帳號，並在同一交易中取消該使用者的所有報班記錄
+        success = self.auth_service.delete_line_user(user_id, delete_applications=True)
         
         if success:
-            # 同時取消該使用者的所有報班記錄
-            applications = self.application_service.get_user_applications(user_id)
-            for app in applications:
-                self.application_service.cancel_application(user_id, app.job_id)
-            
             # 自動將用戶的 Rich Menu 設為未註冊用戶的 Rich Menu
             logger.info(f"用戶 {user_id} 已註銷，準備設定未註冊用戶的 Rich Menu")
             
@@ -1499,34 +1549,7 @@ class JobHandler:
             return
         
         # 顯示報班帳號資料（使用文字訊息，因為內容較長）
-        user_info = f"""📋 您的報班帳號資料：
-
-• 🧑‍💼 姓名：{user.full_name or '未填寫'}
-• 🎂 生日：{user.birthday or '未填寫'}
-• 📞 手機：{user.phone or '未填寫'}
-• 🏠 地址：{user.address or '未填寫'}
-• 🪪 身份證：{user.id_number or '未填寫'}
-• 📬 Email：{user.email or '未填寫'}
-• 註冊時間：{user.created_at}"""
-        
-        # 準備操作按鈕
-        actions = [
-            {
-                "type": "postback",
-                "label": "✏️ 修改資料",
-                "data": "action=edit_profile&step=select_field"
-            },
-            {
-                "type": "postback",
-                "label": "🗑️ 註銷帳號",
-                "data": "action=delete_registration&step=confirm"
-            },
-            {
-                "type": "postback",
-                "label": "🔙 返回主選單",
-                "data": "action=job&step=menu"
-            }
-        ]
+        user_info = _format_user_profile(user)
         
         # 使用 send_multiple_messages 在同一個回覆中發送資料和按鈕
         messages = [
@@ -1534,16 +1557,7 @@ class JobHandler:
                 "type": "text",
                 "text": user_info
             },
-            {
-                "type": "template",
-                "altText": "報班帳號資料操作",
-                "template": {
-                    "type": "buttons",
-                    "title": "📋 報班帳號",
-                    "text": "請選擇操作：",
-                    "actions": actions
-                }
-            }
+            _PROFILE_ACTIONS_MESSAGE
         ]
         
         try:
@@ -1554,63 +1568,13 @@ class JobHandler:
             self.message_service.send_text(reply_token, user_info)
     
     def _build_main_menu_message(self, user_id: Optional[str] = None) -> Dict[str, Any]:
-        """構建主選單訊息（不發送）"""
+        """取得主選單訊息（不發送），依使用者是否已註冊報班帳號選用預先建立的選單"""
         # 檢查使用者是否已註冊報班帳號
         is_registered = False
         if self.auth_service and user_id:
             is_registered = self.auth_service.is_line_user_registered(user_id)
         
-        actions = []
-        
-        if not is_registered:
-            # 未註冊報班帳號使用者：顯示註冊報班帳號選項
-            actions.append({
-                "type": "postback",
-                "label": "📝 註冊報班帳號",
-                "data": "action=register&step=register"
-            })
-        
-        actions.extend([
-            {
-                "type": "postback",
-                "label": "📋 可報班工作",
-                "data": "action=job&step=list"
-            },
-            {
-                "type": "postback",
-                "label": "🔍 已報班記錄",
-                "data": "action=job&step=my_applications"
-            }
-        ])
-        
-        # 已註冊報班帳號使用者：顯示查看報班帳號資料選項
-        if is_registered:
-            actions.append({
-                "type": "postback",
-                "label": "👤 報班帳號",
-                "data": "action=view_profile&step=view"
-            })
-        
-        actions.append({
-            "type": "message",
-            "label": "📞 聯絡客服",
-            "text": "我需要客服協助"
-        })
-        
-        menu_text = "請選擇您需要的服務："
-        if not is_registered:
-            menu_text = "⚠️ 您尚未註冊報班帳號，請先完成註冊才能報班工作。\n\n" + menu_text
-        
-        return {
-            "type": "template",
-            "altText": "💼 Good Jobs 報班系統",
-            "template": {
-                "type": "buttons",
-                "title": "💼 Good Jobs 報班系統",
-                "text": menu_text,
-                "actions": actions
-            }
-        }
+        return _REGISTERED_MAIN_MENU_MESSAGE if is_registered else _UNREGISTERED_MAIN_MENU_MESSAGE
     
     def show_main_menu(self, reply_token: str, user_id: Optional[str] = None) -> None:
         """顯示主選單"""
@@ -26,6 +26,10 @@ JWT_SECRET_KEY = os.getenv(
     "your-secret-key-change-this-in-production"
 )
 JWT_ALGORITHM = "HS256"
+
+# 內部服務呼叫用密鑰（可選，未設定時停用 X-Internal-Token 驗證）
+# 內部呼叫端需帶上 X-Internal-Token: HMAC-SHA256(INTERNAL_API_SECRET, "admin") 的 hex 值
+INTERNAL_API_SECRET = os.getenv("INTERNAL_API_SECRET", None)
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30 天
 
 # 資料庫設定
@@ -47,6 +51,15 @@ ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "admin123")
 # 伺服器設定
 LINE_BOT_PORT = int(os.getenv("LINE_BOT_PORT", "3000"))
 FASTAPI_PORT = int(os.getenv("FASTAPI_PORT", "8880"))
+# FastAPI 同步路由使用的執行緒池大小（anyio 預設為 40）
+API_THREAD_LIMIT = int(os.getenv("API_THREAD_LIMIT", "100"))
+
+# LINE Bot Gunicorn 每個 worker 的執行緒數（僅 gthread 有效）
+GUNICORN_THREADS = int(os.getenv("GUNICORN_THREADS", "16"))
+
+# LINE Bot 背景事件處理設定（Webhook 先回應 200，再由背景執行緒處理事件並回覆）
+REPLY_WORKERS = int(os.getenv("REPLY_WORKERS", "4"))
+REPLY_QUEUE_SIZE = int(os.getenv("REPLY_QUEUE_SIZE", "1024"))
 
 # Rich Menu 設定（可選，如果未設定則不會自動設定 Rich Menu）
 REGISTERED_USER_RICH_MENU_ID = os.getenv("REGISTERED_USER_RICH_MENU_ID", None)
@@ -1,8 +1,11 @@
 """
 資料庫核心設定
 """
-from sqlalchemy import create_engine
+from contextlib import ExitStack
+from typing import Generator
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 from app.config import DATABASE_URL
 from app.core.logger import setup_logger
 
@@ -19,7 +22,7 @@ engine = create_engine(DATABASE_URL, pool_pre_ping=True, echo=False)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-def get_db() -> Session:
+def get_db() -> Generator[Session, None, None]:
     """取得資料庫會話（用於 FastAPI 依賴注入）"""
     db = SessionLocal()
     try:
@@ -28,8 +31,17 @@ def get_db() -> Session:
         db.close()
 
 
+# 同一進程內只需初始化一次（主程式與 FastAPI lifespan 都會呼叫 init_db）
+_db_initialized = False
+
+
 def init_db():
-    """初始化資料庫，建立所有資料表"""
+    """初始化資料庫，建立所有資料表（同一進程內重複呼叫時直接返回）"""
+    global _db_initialized
+    if _db_initialized:
+        logger.debug("資料庫已初始化，略過")
+        return
+    
     # 導入所有模型，確保它們被註冊到 Base.metadata
     from app.models import (  # noqa: F401
         JobModel,
@@ -40,7 +52,32 @@ def init_db():
     
     try:
         Base.metadata.create_all(bind=engine)
+        # create_all 不會替已存在的資料表補建索引，這裡逐一確認
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
+        _db_initialized = True
         logger.info("資料庫表已建立")
     except Exception as e:
         logger.warning(f"資料庫初始化失敗：{e}", exc_info=True)
         raise
+
+
+def warm_up_pool() -> int:
+    """
+    預熱連線池：同時開啟 pool_size 條連線並各執行一次 SELECT 1，
+    讓第一個實際請求不必負擔 TCP 連線與認證的延遲
+
+    返回:
+        int: 成功預熱的連線數量
+    """
+    pool_size = engine.pool.size() if isinstance(engine.pool, QueuePool) else 1
+    warmed = 0
+    # 必須同時持有連線，否則 connect() 只會重複取得同一條連線
+    with ExitStack() as stack:
+        for _ in range(pool_size):
+            conn = stack.enter_context(engine.connect())
+            conn.execute(text("SELECT 1"))
+            warmed += 1
+    logger.info(f"資料庫連線池已預熱：{warmed} 條連線")
+    return warmed
@@ -5,6 +5,10 @@ import logging
 import sys
 import os
 import re
+import queue
+import atexit
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional, Dict, Any
 from datetime import datetime
 
@@ -81,6 +85,54 @@ GUNICORN_ACCESS_LOG_FORMAT = '%(t)s - %(s)s - %(m)s %(U)s%(q)s - %(D)sms'
 # Gunicorn error log 格式（統一格式）
 GUNICORN_ERROR_LOG_FORMAT = "%(asctime)s - gunicorn - %(levelname)s - %(message)s"
 
+# 是否以背景執行緒輸出日誌（請求執行緒只需放入佇列，不必等待 stderr 寫入）
+LOG_ASYNC = os.getenv("LOG_ASYNC", "true").lower() == "true"
+
+
+class ProcessSafeQueueHandler(QueueHandler):
+    """
+    將日誌記錄放入佇列，由背景 QueueListener 寫出
+    
+    Gunicorn master 會在 fork 前建立 logger，而背景執行緒不會被 fork 複製，
+    因此在每個進程第一次寫入日誌時重新建立佇列與 QueueListener。
+    """
+    def __init__(self, target: logging.Handler):
+        super().__init__(queue.SimpleQueue())
+        self.target = target
+        self._listener: Optional[QueueListener] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+    
+    def _ensure_listener(self) -> None:
+        """確保目前進程的背景輸出執行緒已啟動"""
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = queue.SimpleQueue()
+            self._listener = QueueListener(self.queue, self.target)
+            self._listener.start()
+            self._pid = os.getpid()
+            # 進程結束前輸出佇列中剩餘的日誌
+            atexit.register(self._listener.stop)
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._pid != os.getpid():
+            self._ensure_listener()
+        self.queue.put_nowait(record)
+
+
+_console_queue_handler: Optional[ProcessSafeQueueHandler] = None
+
+
+def _get_console_queue_handler() -> ProcessSafeQueueHandler:
+    """取得共用的背景輸出 handler（所有使用預設格式的 logger 共用一個輸出執行緒）"""
+    global _console_queue_handler
+    if _console_queue_handler is None:
+        target = logging.StreamHandler(sys.stderr)
+        target.setFormatter(logging.Formatter(DEFAULT_LOG_FORMAT, DEFAULT_DATE_FORMAT))
+        _console_queue_handler = ProcessSafeQueueHandler(target)
+    return _console_queue_handler
+
 # 日誌級別映射
 LOG_LEVELS = {
     "DEBUG": logging.DEBUG,
@@ -138,6 +190,11 @@ def setup_logger(
     # 清除現有的 handlers（如果有），重新配置以確保正確的格式和級別
     logger.handlers.clear()
     
+    # 使用預設格式時，交由共用的背景執行緒輸出（級別已由 logger 本身過濾）
+    if LOG_ASYNC and format_string is None and date_format is None:
+        logger.addHandler(_get_console_queue_handler())
+        return logger
+    
     # 在 Docker/Gunicorn 環境中，使用 stderr 確保日誌能被 docker logs 捕獲
     # 這樣可以確保日誌在 docker logs -f 中正常顯示
     # Gunicorn 的 --error-logfile - 會捕獲 stderr
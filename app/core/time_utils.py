@@ -4,8 +4,12 @@
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 
-# 台灣時區 UTC+8
-TAIWAN_TZ = timezone(timedelta(hours=8))
+# 台灣時區 UTC+8（固定位移，台灣無日光節約時間，不需 zoneinfo 查表）
+TAIWAN_OFFSET = timedelta(hours=8)
+TAIWAN_TZ = timezone(TAIWAN_OFFSET)
+
+# 顯示用日期時間格式
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
 
 
 def utc_now() -> datetime:
@@ -21,5 +25,6 @@ def format_datetime_taiwan(dt: Optional[datetime]) -> Optional[str]:
     if dt is None:
         return None
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(TAIWAN_TZ).strftime('%Y-%m-%d %H:%M:%S')
+        # DB 中的 naive UTC 時間直接加上固定位移，省去時區物件轉換
+        return (dt + TAIWAN_OFFSET).strftime(DATETIME_FORMAT)
+    return dt.astimezone(TAIWAN_TZ).strftime(DATETIME_FORMAT)
@@ -73,7 +73,7 @@ from app.api.main import api_app
 from app.models.schemas import CreateJobRequest
 
 
-def create_sample_jobs(job_service: JobService, geocoding_service: GeocodingService):
+def create_sample_jobs(job_service: JobService):
     """建立測試工作資料"""
     from app.core.database import SessionLocal
     from app.models.job import JobModel
@@ -134,12 +134,10 @@ def create_sample_jobs(job_service: JobService, geocoding_service: GeocodingServ
         }
     ]
     
-    # 創建帶有地理編碼服務的 JobService
-    job_service_with_geocoding = JobService(geocoding_service=geocoding_service)
-    
+    # 使用傳入的 JobService（已綁定共用的地理編碼服務）
     for job_data in sample_jobs:
         job_request = CreateJobRequest(**job_data)
-        job = job_service_with_geocoding.create_job(job_request)
+        job = job_service.create_job(job_request)
         logger.info(f"已建立測試工作：{job.name} (ID: {job.id})")
     
     logger.info(f"共建立 {len(sample_jobs)} 個測試工作")
@@ -172,7 +170,7 @@ def main():
     auth_service = AuthService()
     
     # 建立測試資料
-    create_sample_jobs(job_service, geocoding_service)
+    create_sample_jobs(job_service)
     
     # 建立 Bot 實例
     bot = PartTimeJobBot(
@@ -1,7 +1,7 @@
 """
 工作相關資料模型
 """
-from sqlalchemy import Column, String, Integer, Float, ARRAY, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, ARRAY, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from app.core.time_utils import utc_now
@@ -40,3 +40,8 @@ class ApplicationModel(Base):
     
     # 關聯
     job = relationship("JobModel", back_populates="applications")
+    
+    # 索引：報班列表以 applied_at DESC 排序
+    __table_args__ = (
+        Index("ix_applications_applied_at", applied_at.desc()),
+    )
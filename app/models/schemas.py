@@ -57,6 +57,23 @@ class User(BaseModel):
 class UserInDB(User):
     """資料庫中的使用者模型（包含密碼）"""
     hashed_password: Optional[str] = None  # LINE 使用者可能沒有密碼
+    
+    def to_public(self) -> User:
+        """轉換為不含密碼的 User（欄位已於載入時驗證，使用 model_construct 跳過重複驗證）"""
+        return User.model_construct(
+            id=self.id,
+            username=self.username,
+            email=self.email,
+            full_name=self.full_name,
+            birthday=self.birthday,
+            phone=self.phone,
+            address=self.address,
+            id_number=self.id_number,
+            is_admin=self.is_admin,
+            is_active=self.is_active,
+            created_at=self.created_at,
+            line_user_id=self.line_user_id
+        )
 
 
 class UserCreate(BaseModel):
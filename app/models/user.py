@@ -1,7 +1,7 @@
 """
 使用者相關資料模型
 """
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, Index
 from app.core.database import Base
 from app.core.time_utils import utc_now
 
@@ -24,3 +24,8 @@ class UserModel(Base):
     line_user_id = Column(String, unique=True, nullable=True, index=True)
     created_at = Column(DateTime, default=utc_now)
     updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
+    
+    # 索引：使用者列表以 created_at DESC 排序
+    __table_args__ = (
+        Index("ix_users_created_at", created_at.desc()),
+    )
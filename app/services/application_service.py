@@ -8,8 +8,9 @@ from sqlalchemy.sql import func
 
 from app.core.database import SessionLocal
 from app.core.time_utils import utc_now
-from app.models.job import ApplicationModel
-from app.models.schemas import Application
+from app.models.job import ApplicationModel, JobModel
+from app.models.schemas import Application, Job
+from app.services.job_service import job_from_model
 
 
 class ApplicationService:
@@ -213,6 +214,59 @@ class ApplicationService:
             if should_close:
                 db.close()
     
+    def get_job_applications_if_job_exists(self, job_id: str, db: Optional[Session] = None) -> Optional[List[Application]]:
+        """
+        以單一查詢確認工作存在並取得其所有報班記錄
+        
+        參數:
+            job_id: 工作ID
+            db: 資料庫會話（可選）
+        
+        返回:
+            list: 報班記錄列表；如果工作不存在則返回 None
+        """
+        if db is None:
+            db = self._get_db()
+            should_close = True
+        else:
+            should_close = False
+        
+        try:
+            # jobs LEFT JOIN applications：工作不存在時沒有任何資料列，
+            # 工作存在但沒有報班時會有一列報班欄位皆為 NULL 的資料
+            rows = db.query(
+                JobModel.id.label('job_exists'),
+                ApplicationModel.id,
+                ApplicationModel.job_id,
+                ApplicationModel.user_id,
+                ApplicationModel.user_name,
+                ApplicationModel.shift,
+                ApplicationModel.applied_at
+            ).outerjoin(
+                ApplicationModel, ApplicationModel.job_id == JobModel.id
+            ).filter(
+                JobModel.id == job_id
+            ).order_by(ApplicationModel.applied_at.desc()).all()
+            
+            if not rows:
+                return None
+            
+            return [
+                Application(
+                    id=row.id,
+                    job_id=row.job_id,
+                    user_id=row.user_id,
+                    user_name=row.user_name,
+                    shift=row.shift,
+                    applied_at=row.applied_at.strftime('%Y-%m-%d %H:%M:%S')
+                )
+                for row in rows
+                if row.id is not None
+            ]
+        finally:
+            if should_close:
+                db.close()
+    
     def get_user_applications(self, user_id: str, db: Optional[Session] = None) -> List[Application]:
         """
         取得使用者的所有報班記錄
@@ -249,3 +303,45 @@ class ApplicationService:
         finally:
             if should_close:
                 db.close()
+    
+    def get_user_applications_with_jobs(self, user_id: str, db: Optional[Session] = None) -> List[Tuple[Application, Optional[Job]]]:
+        """
+        以單一查詢取得使用者的所有報班記錄及其對應工作
+        
+        參數:
+            user_id: 使用者ID
+            db: 資料庫會話（可選）
+        
+        返回:
+            list: (報班記錄, 工作) 列表，依報班時間由新到舊排序；工作已不存在時為 None
+        """
+        if db is None:
+            db = self._get_db()
+            should_close = True
+        else:
+            should_close = False
+        
+        try:
+            # applications LEFT JOIN jobs：工作已刪除的報班仍會保留，工作欄位為 NULL
+            rows = db.query(ApplicationModel, JobModel).outerjoin(
+                JobModel, JobModel.id == ApplicationModel.job_id
+            ).filter(
+                ApplicationModel.user_id == user_id
+            ).order_by(ApplicationModel.applied_at.desc()).all()
+            
+            result = []
+            for app_model, job_model in rows:
+                application = Application(
+                    id=app_model.id,
+                    job_id=app_model.job_id,
+                    user_id=app_model.user_id,
+                    user_name=app_model.user_name,
+                    shift=app_model.shift,
+                    applied_at=app_model.applied_at.strftime('%Y-%m-%d %H:%M:%S')
+                )
+                job = job_from_model(job_model) if job_model is not None else None
+                result.append((application, job))
+            return result
+        finally:
+            if should_close:
+                db.close()
@@ -3,9 +3,11 @@
 """
 import os
 import datetime
+import threading
 from typing import Optional
 from datetime import timedelta
 from sqlalchemy.orm import Session
+from cachetools import TTLCache
 
 from app.core.time_utils import format_datetime_taiwan, utc_now
 from fastapi import HTTPException, status
@@ -15,6 +17,7 @@ from app.core.database import SessionLocal
 from app.core.logger import setup_logger
 from app.core.security import get_password_hash, verify_password, create_access_token, decode_access_token
 from app.models.user import UserModel
+from app.models.job import ApplicationModel
 from app.models.schemas import User, UserInDB, UserCreate, TokenData
 from app.config import JWT_SECRET_KEY, JWT_ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, ADMIN_USERNAME, ADMIN_PASSWORD
 
@@ -25,6 +28,13 @@ logger = setup_logger(__name__)
 class AuthService:
     """認證服務"""
     
+    # 管理員使用者快取（username -> UserInDB），僅用於 API 的 JWT 驗證路徑，同一進程內所有實例共用
+    # 寫入操作會主動清除對應項目，其他進程的異動則最多延遲 TTL 秒生效
+    # LINE 使用者不放入快取：LINE Bot 由多個 worker 處理，資料異動後須立即在各進程生效
+    USER_CACHE_TTL_SECONDS = 60
+    _user_cache: "TTLCache[str, UserInDB]" = TTLCache(maxsize=2000, ttl=USER_CACHE_TTL_SECONDS)
+    _user_cache_lock = threading.Lock()
+    
     def __init__(self, db: Optional[Session] = None):
         """
         初始化認證服務
@@ -41,6 +51,11 @@ class AuthService:
             return self.db
         return SessionLocal()
     
+    def _invalidate_user_cache(self, username: str) -> None:
+        """清除使用者快取"""
+        with self._user_cache_lock:
+            self._user_cache.pop(username, None)
+    
     def _create_default_admin(self):
         """建立預設管理員帳號"""
         db = self._get_db()
@@ -132,6 +147,7 @@ class AuthService:
             db.add(user_model)
             db.commit()
             db.refresh(user_model)
+            self._invalidate_user_cache(user_model.username)
             
             # 返回使用者（不包含密碼）
             return User(
@@ -227,6 +243,7 @@ class AuthService:
                 db.commit()
                 db.refresh(user_model)
             
+            self._invalidate_user_cache(username)
             logger.info(f"已建立 LINE 使用者：{username} (LINE User ID: {line_user_id})")
             
             # 返回使用者（不包含密碼）
@@ -251,7 +268,7 @@ class AuthService:
             if should_close:
                 db.close()
     
-    def update_line_user(self, line_user_id: str, full_name: Optional[str] = None,
+    def update_line_user(self, line_user_id: str, *, full_name: Optional[str] = None,
                         birthday: Optional[str] = None, phone: Optional[str] = None,
                         address: Optional[str] = None, id_number: Optional[str] = None,
                         email: Optional[str] = None, db: Optional[Session] = None) -> Optional[User]:
@@ -265,7 +282,7 @@ class AuthService:
             phone: 手機號碼
             address: 地址
             id_number: 台灣身份證字號
-            email: 電子郵件
+            email: 電子郵件（傳入空字串表示清除）
             db: 資料庫會話（可選）
         
         返回:
@@ -294,11 +311,12 @@ class AuthService:
             if id_number is not None:
                 user_model.id_number = id_number
             if email is not None:
-                user_model.email = email
+                user_model.email = email or None
             user_model.updated_at = utc_now()
             
             db.commit()
             db.refresh(user_model)
+            self._invalidate_user_cache(username)
             
             return User(
                 id=user_model.id,
@@ -321,8 +339,8 @@ class AuthService:
             if should_close:
                 db.close()
     
-    def get_user_by_username(self, username: str, db: Optional[Session] = None) -> Optional[UserInDB]:
-        """根據使用者名稱取得使用者"""
+    def _query_user(self, username: str, db: Optional[Session] = None) -> Optional[UserInDB]:
+        """以使用者名稱從資料庫取得使用者（不經過快取）"""
         if db is None:
             db = self._get_db()
             should_close = True
@@ -353,41 +371,32 @@ class AuthService:
             if should_close:
                 db.close()
     
+    def get_user_by_username(self, username: str, db: Optional[Session] = None) -> Optional[UserInDB]:
+        """根據使用者名稱取得使用者"""
+        return self._query_user(username, db)
+    
+    def _get_token_user(self, username: str) -> Optional[UserInDB]:
+        """取得 JWT Token 對應的使用者（只快取管理員帳號）"""
+        with self._user_cache_lock:
+            cached_user = self._user_cache.get(username)
+        if cached_user is not None:
+            return cached_user
+        
+        user = self._query_user(username)
+        if user is not None and user.is_admin:
+            with self._user_cache_lock:
+                self._user_cache[username] = user
+        return user
+    
     def get_user_by_line_id(self, line_user_id: str, db: Optional[Session] = None) -> Optional[UserInDB]:
         """根據 LINE User ID 取得使用者"""
-        if db is None:
-            db = self._get_db()
-            should_close = True
-        else:
-            should_close = False
-        
-        try:
-            # 直接使用 LINE User ID 作為使用者名稱
-            user_model = db.query(UserModel).filter(UserModel.username == line_user_id).first()
-            if not user_model:
-                return None
-            
-            return UserInDB(
-                id=user_model.id,
-                username=user_model.username,
-                email=user_model.email,
-                full_name=user_model.full_name,
-                birthday=user_model.birthday,
-                phone=user_model.phone,
-                address=user_model.address,
-                id_number=user_model.id_number,
-                is_admin=user_model.is_admin,
-                is_active=user_model.is_active,
-                created_at=format_datetime_taiwan(user_model.created_at),
-                line_user_id=user_model.line_user_id,
-                hashed_password=user_model.hashed_password
-            )
-        finally:
-            if should_close:
-                db.close()
+        # 直接使用 LINE User ID 作為使用者名稱查詢
+        # 不使用快取：使用者資料可能剛在其他 worker 修改，各進程快取無法互相清除
+        return self._query_user(line_user_id, db)
     
     def is_line_user_registered(self, line_user_id: str, db: Optional[Session] = None) -> bool:
         """檢查 LINE 使用者是否已註冊報班帳號"""
+        # 不使用快取：使用者可能已在其他 worker 註銷，報班前必須以資料庫為準
         if db is None:
             db = self._get_db()
             should_close = True
@@ -431,13 +440,14 @@ class AuthService:
             if should_close:
                 db.close()
     
-    def delete_line_user(self, line_user_id: str, db: Optional[Session] = None) -> bool:
+    def delete_line_user(self, line_user_id: str, db: Optional[Session] = None, delete_applications: bool = False) -> bool:
         """
         取消 LINE 使用者註冊報班帳號
         
         參數:
             line_user_id: LINE User ID
             db: 資料庫會話（可選）
+            delete_applications: 是否同時取消該使用者的所有報班（與刪除使用者在同一交易中提交）
         
         返回:
             bool: 是否成功取消
@@ -455,9 +465,16 @@ class AuthService:
             if not user_model:
                 return False
             
+            if delete_applications:
+                # 與刪除使用者同一交易：任一步失敗即整體回滾，不會只取消報班而保留帳號
+                db.query(ApplicationModel).filter(
+                    ApplicationModel.user_id == line_user_id
+                ).delete(synchronize_session=False)
+            
             # 刪除使用者
             db.delete(user_model)
             db.commit()
+            self._invalidate_user_cache(username)
             
             logger.info(f"已取消 LINE 使用者註冊報班帳號：{username} (LINE User ID: {line_user_id})")
             return True
@@ -516,7 +533,7 @@ class AuthService:
         token_data = self.verify_token(token)
         if token_data is None or token_data.username is None:
             raise credentials_exception
-        user = self.get_user_by_username(token_data.username)
+        user = self._get_token_user(token_data.username)
         if user is None:
             raise credentials_exception
         return user
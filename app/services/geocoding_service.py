@@ -2,8 +2,10 @@
 Google Maps Geocoding 服務
 """
 import os
+import threading
 from typing import Optional, Tuple
 import requests
+from cachetools import TTLCache
 
 from app.config import GOOGLE_MAPS_API_KEY
 from app.core.logger import setup_logger
@@ -11,6 +13,10 @@ from app.core.logger import setup_logger
 # 設置 logger
 logger = setup_logger(__name__)
 
+# 地理編碼結果快取設定（地址與座標的對應很少變動，預設保留 7 天）
+GEOCODE_CACHE_MAXSIZE = 4096
+GEOCODE_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
 
 class GeocodingService:
     """Google Maps Geocoding 服務"""
@@ -24,6 +30,14 @@ class GeocodingService:
         """
         self.api_key = api_key or GOOGLE_MAPS_API_KEY
         self.geocoding_url = "https://maps.googleapis.com/maps/api/geocode/json"
+        # 只快取成功的結果，失敗時下次仍會重新查詢
+        self._coordinates_cache: "TTLCache[str, Tuple[float, float]]" = TTLCache(
+            maxsize=GEOCODE_CACHE_MAXSIZE, ttl=GEOCODE_CACHE_TTL_SECONDS
+        )
+        self._address_cache: "TTLCache[Tuple[float, float], str]" = TTLCache(
+            maxsize=GEOCODE_CACHE_MAXSIZE, ttl=GEOCODE_CACHE_TTL_SECONDS
+        )
+        self._cache_lock = threading.Lock()
     
     def get_coordinates(self, address: str) -> Optional[Tuple[float, float]]:
         """
@@ -39,6 +53,12 @@ class GeocodingService:
             logger.warning("未設定 GOOGLE_MAPS_API_KEY，無法取得座標")
             return None
         
+        cache_key = address.strip().lower()
+        with self._cache_lock:
+            cached = self._coordinates_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             params = {
                 "address": address,
@@ -58,7 +78,10 @@ class GeocodingService:
                 
                 if latitude and longitude:
                     logger.debug(f"成功取得座標：{address} -> ({latitude}, {longitude})")
-                    return (float(latitude), float(longitude))
+                    coordinates = (float(latitude), float(longitude))
+                    with self._cache_lock:
+                        self._coordinates_cache[cache_key] = coordinates
+                    return coordinates
                 else:
                     logger.warning(f"無法從回應中取得座標：{address}")
                     return None
@@ -92,6 +115,13 @@ class GeocodingService:
             logger.warning("未設定 GOOGLE_MAPS_API_KEY，無法取得地址")
             return None
         
+        # 座標取到小數第 5 位（約 1 公尺）作為快取 key
+        cache_key = (round(latitude, 5), round(longitude, 5))
+        with self._cache_lock:
+            cached = self._address_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             params = {
                 "latlng": f"{latitude},{longitude}",
@@ -108,6 +138,8 @@ class GeocodingService:
                 formatted_address = data["results"][0].get("formatted_address")
                 if formatted_address:
                     logger.debug(f"成功取得地址：({latitude}, {longitude}) -> {formatted_address}")
+                    with self._cache_lock:
+                        self._address_cache[cache_key] = formatted_address
                     return formatted_address
                 else:
                     logger.warning(f"無法從回應中取得地址：({latitude}, {longitude})")
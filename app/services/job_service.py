@@ -1,9 +1,11 @@
 """
 工作管理服務
 """
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 import datetime
+import threading
 from sqlalchemy.orm import Session
+from cachetools import TTLCache
 
 from app.core.database import SessionLocal
 from app.core.logger import setup_logger
@@ -15,9 +17,40 @@ from app.services.geocoding_service import GeocodingService
 logger = setup_logger(__name__)
 
 
+def job_from_model(job_model: JobModel) -> Job:
+    """
+    將資料庫記錄轉換為 Job 模型
+    
+    資料庫欄位型別已與 Job 一致，以 model_construct 建立，省去逐欄位的 Pydantic 驗證
+    
+    參數:
+        job_model: 工作資料表記錄
+    
+    返回:
+        Job: 工作資料模型
+    """
+    return Job.model_construct(
+        id=job_model.id,
+        name=job_model.name,
+        location=job_model.location,
+        date=job_model.date,
+        shifts=job_model.shifts,
+        location_image_url=job_model.location_image_url,
+        latitude=job_model.latitude,
+        longitude=job_model.longitude
+    )
+
+
 class JobService:
     """工作管理服務"""
     
+    # 工作快取（job_id -> Job），同一進程內所有實例共用
+    # 報班流程中「選擇班別」緊接在「報班」之後，前一步讀取的工作可直接沿用
+    # 工作建立後不會被修改或刪除，快取僅以 TTL 控制記憶體
+    JOB_CACHE_TTL_SECONDS = 300
+    _job_cache: "TTLCache[str, Job]" = TTLCache(maxsize=1000, ttl=JOB_CACHE_TTL_SECONDS)
+    _job_cache_lock = threading.Lock()
+    
     def __init__(self, db: Optional[Session] = None, geocoding_service: Optional[GeocodingService] = None):
         """
         初始化工作服務
@@ -114,16 +147,7 @@ class JobService:
             db.refresh(job_model)
             
             # 轉換為 Pydantic 模型
-            job = Job(
-                id=job_model.id,
-                name=job_model.name,
-                location=job_model.location,
-                date=job_model.date,
-                shifts=job_model.shifts,
-                location_image_url=job_model.location_image_url,
-                latitude=job_model.latitude,
-                longitude=job_model.longitude
-            )
+            job = job_from_model(job_model)
             
             return job
         except Exception as e:
@@ -134,7 +158,12 @@ class JobService:
                 db.close()
     
     def get_job(self, job_id: str, db: Optional[Session] = None) -> Optional[Job]:
-        """取得工作"""
+        """取得工作（優先使用快取）"""
+        with self._job_cache_lock:
+            cached_job = self._job_cache.get(job_id)
+        if cached_job is not None:
+            return cached_job
+        
         if db is None:
             db = self._get_db()
             should_close = True
@@ -146,16 +175,39 @@ class JobService:
             if not job_model:
                 return None
             
-            return Job(
-                id=job_model.id,
-                name=job_model.name,
-                location=job_model.location,
-                date=job_model.date,
-                shifts=job_model.shifts,
-                location_image_url=job_model.location_image_url,
-                latitude=job_model.latitude,
-                longitude=job_model.longitude
-            )
+            job = job_from_model(job_model)
+            with self._job_cache_lock:
+                self._job_cache[job_id] = job
+            return job
+        finally:
+            if should_close:
+                db.close()
+    
+    def get_jobs_bulk(self, job_ids: Iterable[str], db: Optional[Session] = None) -> Dict[str, Job]:
+        """
+        一次查詢多個工作（避免逐筆呼叫 get_job 造成 N+1 查詢）
+        
+        參數:
+            job_ids: 工作 ID 列表
+            db: 資料庫會話（可選）
+        
+        返回:
+            Dict[str, Job]: 工作 ID -> 工作（不存在的 ID 不會出現在結果中）
+        """
+        job_ids = set(job_ids)
+        if not job_ids:
+            return {}
+        
+        if db is None:
+            db = self._get_db()
+            should_close = True
+        else:
+            should_close = False
+        
+        try:
+            job_models = db.query(JobModel).filter(JobModel.id.in_(job_ids)).all()
+            jobs = [job_from_model(job_model) for job_model in job_models]
+            return {job.id: job for job in jobs}
         finally:
             if should_close:
                 db.close()
@@ -170,19 +222,7 @@ class JobService:
         
         try:
             job_models = db.query(JobModel).order_by(JobModel.date).all()
-            return [
-                Job(
-                    id=job.id,
-                    name=job.name,
-                    location=job.location,
-                    date=job.date,
-                    shifts=job.shifts,
-                    location_image_url=job.location_image_url,
-                    latitude=job.latitude,
-                    longitude=job.longitude
-                )
-                for job in job_models
-            ]
+            return [job_from_model(job) for job in job_models]
         finally:
             if should_close:
                 db.close()
@@ -200,19 +240,7 @@ class JobService:
             # 按日期升序排序（從早到晚），確保工作按照日期順序顯示
             job_models = db.query(JobModel).filter(JobModel.date >= today).order_by(JobModel.date.asc()).all()
             
-            jobs = [
-                Job(
-                    id=job.id,
-                    name=job.name,
-                    location=job.location,
-                    date=job.date,
-                    shifts=job.shifts,
-                    location_image_url=job.location_image_url,
-                    latitude=job.latitude,
-                    longitude=job.longitude
-                )
-                for job in job_models
-            ]
+            jobs = [job_from_model(job) for job in job_models]
             
             # 再次確保排序正確（以防資料庫排序有問題）
             # 由於 date 是 YYYY-MM-DD 格式的字串，可以直接排序
@@ -2,13 +2,27 @@
 LINE 訊息發送服務
 """
 from typing import List, Dict
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
+from app.config import GUNICORN_THREADS, REPLY_WORKERS
 from app.core.logger import setup_logger
 
 # 設置 logger
 logger = setup_logger(__name__)
 
+# LINE API 請求逾時（秒）：(連線, 讀取)，避免單一請求長時間佔用處理執行緒
+LINE_API_TIMEOUT = (3.05, 10)
+
+# LINE Reply API 單次回覆最多可包含的訊息數量
+LINE_REPLY_MAX_MESSAGES = 5
+
+# LINE API 連線池大小：平時只有背景回覆執行緒發送；進程結束清空佇列（atexit）期間，
+# 新進的事件改由 Gunicorn 請求執行緒直接處理並與背景執行緒同時發送，
+# 連線池需容納兩者，避免多餘的連線被丟棄後重新進行 TCP/TLS 握手
+LINE_API_POOL_SIZE = REPLY_WORKERS + GUNICORN_THREADS
+
 
 class LineMessageService:
     """LINE 訊息發送服務"""
@@ -16,6 +30,18 @@ class LineMessageService:
     def __init__(self, channel_access_token: str):
         self.token = channel_access_token
         self.api_url = "https://api.line.me/v2/bot/message/reply"
+        # 共用 HTTP Session，重複使用與 LINE API 的 TCP/TLS 連線（keep-alive）
+        self.session = requests.Session()
+        self.session.headers.update(self._get_headers())
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=LINE_API_POOL_SIZE)
+        self.session.mount("https://", adapter)
+    
+    def warm_up(self) -> None:
+        """預先建立與 LINE API 的連線（DNS 解析與 TLS 握手），降低第一次回覆的延遲"""
+        try:
+            self.session.head("https://api.line.me/", timeout=2)
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"LINE API 連線預熱失敗（不影響運作）：{e}")
     
     def _get_headers(self) -> Dict[str, str]:
         """取得 API 請求標頭"""
@@ -24,6 +50,14 @@ class LineMessageService:
             "Authorization": f"Bearer {self.token}"
         }
     
+    def _post(self, payload: Dict) -> requests.Response:
+        """以 orjson 序列化並送出回覆請求（Content-Type 已由 Session 標頭設定）"""
+        return self.session.post(
+            self.api_url,
+            data=orjson.dumps(payload),
+            timeout=LINE_API_TIMEOUT
+        )
+    
     def send_text(self, reply_token: str, text: str) -> requests.Response:
         """發送文字訊息"""
         payload = {
@@ -33,12 +67,7 @@ class LineMessageService:
                 "text": text
             }]
         }
-        return requests.post(
-            self.api_url,
-            headers=self._get_headers(),
-            json=payload,
-            timeout=10
-        )
+        return self._post(payload)
     
     def send_flex_message(self, reply_token: str, alt_text: str, contents: Dict) -> requests.Response:
         """發送 Flex 訊息"""
@@ -50,25 +79,20 @@ class LineMessageService:
                 "contents": contents
             }]
         }
-        return requests.post(
-            self.api_url,
-            headers=self._get_headers(),
-            json=payload,
-            timeout=10
-        )
+        return self._post(payload)
     
     def send_multiple_messages(self, reply_token: str, messages: List[Dict]) -> requests.Response:
-        """在同一個回覆中發送多個訊息"""
+        """在同一個回覆中發送多個訊息（單一 API 請求，LINE 每次回覆最多 5 則訊息）"""
+        if len(messages) > LINE_REPLY_MAX_MESSAGES:
+            # 最後防線：呼叫端應自行控制訊息數量，出現此錯誤代表呼叫端有誤
+            logger.error(f"回覆訊息數量 {len(messages)} 超過上限 {LINE_REPLY_MAX_MESSAGES}，多出的訊息將不會發送")
+            messages = messages[:LINE_REPLY_MAX_MESSAGES]
         payload = {
             "replyToken": reply_token,
             "messages": messages
         }
         try:
-            response = requests.post(
-                self.api_url,
-                headers=self._get_headers(),
-                json=payload
-            )
+            response = self._post(payload)
             response.raise_for_status()  # 如果狀態碼不是 2xx，會拋出異常
             return response
         except requests.exceptions.RequestException as e:
@@ -99,12 +123,7 @@ class LineMessageService:
             "messages": [buttons_template]
         }
         
-        return requests.post(
-            self.api_url,
-            headers=self._get_headers(),
-            json=payload,
-            timeout=10
-        )
+        return self._post(payload)
     
     def send_carousel_template(self, reply_token: str, alt_text: str, columns: List[Dict]) -> requests.Response:
         """
@@ -141,12 +160,7 @@ class LineMessageService:
         }
         
         try:
-            response = requests.post(
-                self.api_url,
-                headers=self._get_headers(),
-                json=payload,
-                timeout=10
-            )
+            response = self._post(payload)
             response.raise_for_status()
             return response
         except requests.exceptions.RequestException as e:
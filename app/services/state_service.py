@@ -51,14 +51,14 @@ class StateService:
             ).first()
             
             if not state_model:
-                logger.debug(f"get_registration_state: user_id: {user_id} 沒有找到狀態")
+                logger.debug("get_registration_state: user_id: %s 沒有找到狀態", user_id)
                 return None
             
             state = {
                 'step': state_model.step,
                 'data': state_model.get_data_dict()
             }
-            logger.debug(f"get_registration_state: user_id: {user_id}, state: {state}")
+            logger.debug("get_registration_state: user_id: %s, step: %s, 已填欄位: %s", user_id, state['step'], list(state['data']))
             return state
         except Exception as e:
             logger.error(f"取得註冊狀態失敗：{e}", exc_info=True)
@@ -155,7 +155,7 @@ class StateService:
             
             db.commit()
             db.refresh(state_model)
-            logger.debug(f"update_registration_state: user_id: {user_id}, step: {step}, data: {data}")
+            logger.debug("update_registration_state: user_id: %s, step: %s, 已填欄位: %s", user_id, step, list(data) if data else [])
             return True
         except Exception as e:
             logger.error(f"更新註冊狀態失敗：{e}", exc_info=True)
@@ -220,11 +220,11 @@ class StateService:
             ).first()
             
             if not state_model:
-                logger.debug(f"get_edit_profile_state: user_id: {user_id} 沒有找到狀態")
+                logger.debug("get_edit_profile_state: user_id: %s 沒有找到狀態", user_id)
                 return None
             
             state = state_model.get_data_dict()
-            logger.debug(f"get_edit_profile_state: user_id: {user_id}, state: {state}")
+            logger.debug("get_edit_profile_state: user_id: %s, state: %s", user_id, state)
             return state
         except Exception as e:
             logger.error(f"取得編輯資料狀態失敗：{e}", exc_info=True)
@@ -331,21 +331,16 @@ class StateService:
         返回:
             清理的狀態數量
         """
-        from sqlalchemy import and_
-        
         db = self._get_db()
         should_close = self.db is None
         
         try:
             expire_time = utc_now() - timedelta(hours=hours)
             
-            expired_states = db.query(RegistrationStateModel).filter(
+            # 單一 DELETE 語句刪除，不需先將過期狀態載入為 ORM 物件
+            count = db.query(RegistrationStateModel).filter(
                 RegistrationStateModel.updated_at < expire_time
-            ).all()
-            
-            count = len(expired_states)
-            for state in expired_states:
-                db.delete(state)
+            ).delete(synchronize_session=False)
             
             db.commit()
             logger.info(f"清理了 {count} 個過期狀態（超過 {hours} 小時未更新）")
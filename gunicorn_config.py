@@ -4,14 +4,19 @@ Gunicorn 配置文件
 import multiprocessing
 import os
 
+from app.config import GUNICORN_THREADS
+
 # 綁定地址和端口
 bind = f"0.0.0.0:{os.getenv('LINE_BOT_PORT', '3000')}"
 
 # Worker 數量（建議：CPU 核心數 * 2 + 1）
 workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
 
-# Worker 類型
-worker_class = "sync"
+# Worker 類型（Webhook 以 I/O 為主，預設使用 gthread）
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+
+# 每個 worker 的執行緒數（僅 gthread 有效）
+threads = GUNICORN_THREADS
 
 # 超時設定（秒）
 timeout = 120
@@ -31,10 +36,10 @@ proc_name = "good-job-bot"
 max_requests = 1000
 max_requests_jitter = 50
 
-# 預載入應用程式（提高性能）
-preload_app = True
+# 不預載入應用程式：每個 worker 透過 create_app() 各自初始化，避免資源跨 fork 共用
+preload_app = False
 
-# 優雅重啟超時時間
+# 優雅重啟超時時間（app/bot/bot.py 的 EVENT_DRAIN_TIMEOUT_SECONDS 需小於此值）
 graceful_timeout = 30
 
 
@@ -0,0 +1,38 @@
+"""
+PartTimeJobBot.run() 啟動流程測試
+"""
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("flask")
+
+from app.bot import bot as bot_module
+from app.config import GUNICORN_THREADS
+
+
+def test_run_builds_gunicorn_argv_and_starts_gunicorn(monkeypatch):
+    """run() 應組好 Gunicorn 參數並呼叫 Gunicorn 的 run()，不應回退到 Flask 開發伺服器"""
+    calls = []
+    
+    # 以假的 gunicorn.app.wsgiapp 模組取代實際的 Gunicorn，記錄呼叫時的 sys.argv
+    fake_wsgiapp = types.ModuleType("gunicorn.app.wsgiapp")
+    fake_wsgiapp.run = lambda: calls.append(list(sys.argv))
+    monkeypatch.setitem(sys.modules, "gunicorn", types.ModuleType("gunicorn"))
+    monkeypatch.setitem(sys.modules, "gunicorn.app", types.ModuleType("gunicorn.app"))
+    monkeypatch.setitem(sys.modules, "gunicorn.app.wsgiapp", fake_wsgiapp)
+    monkeypatch.setattr(sys, "argv", list(sys.argv))
+    monkeypatch.setattr(bot_module, "setup_gunicorn_logger", lambda: None)
+    
+    # 不建立服務與資料庫連線，只測試 run() 的啟動流程
+    bot = object.__new__(bot_module.PartTimeJobBot)
+    bot.flask_app = None  # 若回退到 Flask 開發伺服器，會在使用 flask_app 時失敗
+    bot.run(port=3100, use_gunicorn=True, use_threading=False)
+    
+    assert len(calls) == 1
+    argv = calls[0]
+    assert argv[0] == "gunicorn"
+    assert argv[argv.index("--bind") + 1] == "0.0.0.0:3100"
+    assert argv[argv.index("--threads") + 1] == str(GUNICORN_THREADS)
+    assert argv[-1] == "app.bot.bot:create_app()"